@@ -2,6 +2,7 @@ import os
 import math
 import random
 import shutil
+import time
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 from tqdm import tqdm
@@ -26,11 +27,20 @@ class BatchManager:
         self.output_path = config['output']['output_dir']
         self.batch_dir = config['output']['batches_dir']
         
+        # (directory -> mtime of every directory walked, CIF files found) from the last scan
+        self._cif_scan = None
+        
         # Find all CIF files in the database
         self.cif_files = self._find_cif_files()
         
         # Create a directory for batch information
         os.makedirs(self.batch_dir, exist_ok=True)
+        
+        # Batch ID -> (batch file mtime, file paths) for get_batch_files
+        self._batch_files_cache = {}
+        
+        # (batch directory mtime, highest batch number) for _get_max_batch_number
+        self._batch_dir_scan = None
     
     def _find_cif_files(self) -> List[str]:
         """Find all CIF files in the database directory"""
@@ -45,11 +55,18 @@ class BatchManager:
             print(f"Warning: Database path {self.database_path} does not exist")
             return []
             
-        # Search recursively for CIF files
-        for root, _, files in os.walk(self.database_path):
-            for file in files:
-                if file.lower().endswith('.cif'):
-                    cif_files.append(os.path.join(root, file))
+        if self._cif_scan is not None and self._cif_scan_is_current():
+            # No directory gained or lost entries since the last walk
+            cif_files = list(self._cif_scan[1])
+        else:
+            # Search recursively for CIF files
+            dir_mtimes = {}
+            for root, _, files in os.walk(self.database_path):
+                dir_mtimes[root] = os.stat(root).st_mtime_ns
+                for file in files:
+                    if file.lower().endswith('.cif'):
+                        cif_files.append(os.path.join(root, file))
+            self._cif_scan = (dir_mtimes, tuple(cif_files))
     
         if cif_files:
             print(f"Found {len(cif_files)} CIF files")
@@ -58,6 +75,43 @@ class BatchManager:
     
         return cif_files
     
+    def _cif_scan_is_current(self) -> bool:
+        """
+        Check whether the last CIF file scan still matches the database directory
+        
+        Adding, removing or renaming an entry updates its parent directory's mtime, and a
+        new subdirectory changes its parent's, so comparing the mtimes of the walked
+        directories detects any change to the set of files without listing them.
+        
+        Returns:
+            True if every walked directory still exists with the same mtime
+        """
+        for directory, mtime in self._cif_scan[0].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+    
+    def has_any_cif_files(self) -> bool:
+        """
+        Check whether the database contains at least one CIF file
+        
+        Unlike _find_cif_files, the walk stops at the first CIF file found.
+        
+        Returns:
+            True if a CIF file was found, False otherwise
+        """
+        if os.path.isfile(self.database_path):
+            return self.database_path.endswith('.cif')
+        if self._cif_scan is not None and self._cif_scan_is_current():
+            return bool(self._cif_scan[1])
+        for _, _, files in os.walk(self.database_path):
+            if any(file.lower().endswith('.cif') for file in files):
+                return True
+        return False
+    
     def create_batches(self) -> List[List[str]]:
         """Create batches of CIF files using the specified strategy"""
         if not self.cif_files:
@@ -65,6 +119,7 @@ class BatchManager:
             return []
             
         print(f"Creating batches using strategy: {self.strategy}")
+        self._batch_files_cache.clear()
         
         if self.strategy == 'alphabetical':
             return self._create_alphabetical_batches()
@@ -200,15 +255,31 @@ class BatchManager:
         return batches
     
     def get_batch_files(self, batch_id: int) -> List[str]:
-        """Get file paths for a specific batch"""
+        """
+        Get file paths for a specific batch
+        
+        Results are cached per batch until the batch file is rewritten.
+        
+        Args:
+            batch_id: Batch ID
+            
+        Returns:
+            Paths of the batch's files that exist, as strings
+        """
         # Ensure batch_id is an integer
         batch_id = int(batch_id)
         
         batch_file = os.path.join(self.batch_dir, f'batch_{batch_id}.csv')
         
-        if not os.path.exists(batch_file):
+        try:
+            mtime = os.stat(batch_file).st_mtime_ns
+        except FileNotFoundError:
             raise ValueError(f"Batch file not found: {batch_file}")
         
+        cached = self._batch_files_cache.get(batch_id)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+        
         try:
             batch_df = pd.read_csv(batch_file)
             # Ensure all file paths are strings and exist
@@ -222,31 +293,74 @@ class BatchManager:
             
             if not file_paths:
                 print(f"Warning: No valid files in batch {batch_id}")
-                
+            
+            self._batch_files_cache[batch_id] = (mtime, tuple(file_paths))
             return file_paths
         except Exception as e:
             print(f"Error reading batch file {batch_file}: {e}")
             return []
     
-    def get_num_batches(self) -> int:
-        """Get the total number of batches"""
-        # If batch directory exists and has batch files, count actual batches
-        if os.path.exists(self.batch_dir):
-            batch_files = [f for f in os.listdir(self.batch_dir) 
-                           if f.startswith('batch_') and f.endswith('.csv')]
-            
-            if batch_files:
-                # Get the maximum batch number from filenames
-                max_batch = 0
-                for filename in batch_files:
+    def _get_max_batch_number(self) -> Optional[int]:
+        """
+        Get the highest batch number among the batch_X.csv files in one directory pass
+        
+        The result is reused while the batch directory's mtime is unchanged. A directory
+        modified in the last two seconds is always scanned again, since a file added within
+        the same mtime tick would not change it on filesystems with coarse timestamps, unless
+        this process wrote the newest file itself (see _record_batch_file).
+        
+        Returns:
+            Highest batch number (0 if no name has a number), or None if there are no batch files
+        """
+        try:
+            mtime = os.stat(self.batch_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if self._batch_dir_scan is not None and self._batch_dir_scan[0] == mtime:
+            return self._batch_dir_scan[1]
+        
+        max_batch = None
+        with os.scandir(self.batch_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('batch_') and name.endswith('.csv'):
+                    if max_batch is None:
+                        max_batch = 0
                     try:
                         # Extract the number from batch_X.csv
-                        batch_num = int(filename.replace('batch_', '').replace('.csv', ''))
-                        max_batch = max(max_batch, batch_num)
+                        max_batch = max(max_batch, int(name[len('batch_'):-len('.csv')]))
                     except ValueError:
                         pass
-                        
-                return max_batch
+        
+        # A recent directory is cached too so _record_batch_file can keep it current; it is
+        # scanned again on the next call unless this process wrote the newest file
+        self._batch_dir_scan = (mtime if time.time_ns() - mtime > 2_000_000_000 else None, max_batch)
+        return max_batch
+    
+    def _record_batch_file(self, batch_id: int) -> None:
+        """
+        Update the cached batch number after this process wrote batch_{batch_id}.csv
+        
+        Back-to-back single-CIF submissions then cost one stat each instead of a directory
+        scan; a file added by another writer changes the mtime and triggers a new scan.
+        
+        Args:
+            batch_id: Number of the batch file that was just written
+        """
+        if self._batch_dir_scan is None:
+            return
+        try:
+            mtime = os.stat(self.batch_dir).st_mtime_ns
+        except FileNotFoundError:
+            return
+        self._batch_dir_scan = (mtime, max(self._batch_dir_scan[1] or 0, batch_id))
+    
+    def get_num_batches(self) -> int:
+        """Get the total number of batches"""
+        # If batch directory exists and has batch files, count actual batches
+        max_batch = self._get_max_batch_number()
+        if max_batch is not None:
+            return max_batch
         
         # If no batch files found or directory doesn't exist, 
         # calculate theoretical number (for initial batch creation)
@@ -256,9 +370,5 @@ class BatchManager:
     
     def has_batches(self) -> bool:
         """Check if any batches have been created"""
-        if not os.path.exists(self.batch_dir):
-            return False
-            
         # Look for batch_*.csv files
-        batch_files = [f for f in os.listdir(self.batch_dir) if f.startswith('batch_') and f.endswith('.csv')]
-        return len(batch_files) > 0
\ No newline at end of file
+        return self._get_max_batch_number() is not None
\ No newline at end of file
@@ -148,6 +148,9 @@ def main():
                         help='Path to configuration file')
     parser.add_argument('--polling-interval', '-p', type=int, default=60,
                         help='Polling interval in seconds (default: 60)')
+    parser.add_argument('--max-polling-interval', type=int, default=None,
+                        help='Let the polling interval double up to this many seconds while no '
+                             'job changes state (default: fixed interval)')
     parser.add_argument('--create-default-config', action='store_true',
                         help='Create a default configuration file')
     parser.add_argument('--prepare-only', action='store_true',
@@ -361,7 +364,8 @@ def main():
                 
             tracker.run(polling_interval=args.polling_interval,
                         dry_run=args.dry_run,
-                        resubmit_failed=resubmit_failed)
+                        resubmit_failed=resubmit_failed,
+                        max_polling_interval=args.max_polling_interval)
             if not tracker.job_status.empty:
                 print(f"Batch {args.submit_batch} submitted successfully")
                 return 0
@@ -634,14 +638,10 @@ def main():
                 
                 # We'll use the job scheduler's method for workflow stage detection
                 # This avoids hardcoding and handles all cases appropriately
-                for idx, row in tracker.job_status.iterrows():
-                    batch_id = row['batch_id']
-                    job_id = row['job_id']
-                    status = row['status']
-                    current_workflow_stage = row['workflow_stage'] if not pd.isna(row['workflow_stage']) else ""
-                    
-                    # Get batch output directory to use for detecting workflow stage
-                    batch_output_dir = os.path.join(tracker.results_dir, f'batch_{batch_id}')
+                columns = tracker.job_status[['batch_id', 'status', 'workflow_stage']]
+                stage_updates = {}
+                for idx, batch_id, status, workflow_stage in columns.itertuples(index=True, name=None):
+                    current_workflow_stage = workflow_stage if not pd.isna(workflow_stage) else ""
                     
                     # Use job scheduler's method to determine current workflow stage
                     # This method already handles all statuses correctly including COMPLETED, FAILED, etc.
@@ -649,10 +649,13 @@ def main():
                     
                     # Only update if different from current value
                     if new_workflow_stage != current_workflow_stage:
-                        tracker.job_status.loc[idx, 'workflow_stage'] = new_workflow_stage
+                        stage_updates[idx] = {'workflow_stage': new_workflow_stage}
                         print(f"Updated workflow stage for batch {batch_id}: {current_workflow_stage or '(empty)'} → {new_workflow_stage}")
                         fixed_count += 1
                 
+                # Apply all stage updates at once
+                tracker._apply_job_updates(stage_updates)
+                
                 # Save the job status if we made any changes
                 if fixed_count > 0:
                     print(f"Updated workflow stage for {fixed_count} jobs")
@@ -664,7 +667,7 @@ def main():
                 if tracker.job_status.empty:
                     print("No jobs found in tracking file.")
                 else:
-                    status_counts = tracker.job_status['status'].value_counts().to_dict()
+                    status_counts = tracker.get_status_counts()
                     print(f"PENDING:   {status_counts.get('PENDING', 0)}")
                     print(f"RUNNING:   {status_counts.get('RUNNING', 0)}")
                     print(f"COMPLETED: {status_counts.get('COMPLETED', 0)}")
@@ -674,6 +677,9 @@ def main():
                     if other > 0:
                         print(f"OTHER:     {other}")
                 
+                # Fold the failures logged during this update into failed_batches.txt
+                tracker._compact_failed_batches()
+                
                 print(f"\nJob status saved to: {tracker.job_status_file}")
                 if tracker.failed_batches:
                     print(f"Failed batches saved to: {tracker.failed_batches_file}")
@@ -771,7 +777,8 @@ def main():
         # The prepare_environment() will be called inside run()
         tracker.run(polling_interval=args.polling_interval, \
             dry_run=args.dry_run,
-            resubmit_failed=resubmit_failed)
+            resubmit_failed=resubmit_failed,
+            max_polling_interval=args.max_polling_interval)
         
     except Exception as e:
         print(f"⚠️ ERROR: Configuration error: {e}")
@@ -2,14 +2,28 @@ import os
 import subprocess
 import importlib
 import sys
+import time
 from typing import Dict, Any, List, Optional, Callable, Union, Tuple, Set
 import tempfile
+import uuid
+import threading
+import concurrent.futures
 from pathlib import Path
 import importlib.util
 
+from .utils import atomic_write_csv, file_lock
+
+# Location of this package, resolved once at import time (importing the package
+# itself here would be circular, so derive it from this module)
+_PKG_NAME = __name__.split('.')[0]
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class JobScheduler:
     """Handle SLURM job submission and management with support for Python and Bash scripts"""
     
+    # Upper bound on concurrent sbatch calls in submit_jobs
+    MAX_PARALLEL_SUBMISSIONS = 8
+    
     def __init__(self, config: Dict[str, Any], batch_range: Optional[Tuple[int, int]] = None):
         """
         Initialize the job scheduler
@@ -30,6 +44,14 @@ class JobScheduler:
         self.scripts = config.get('scripts', {})
         self.templates = config.get('file_templates', {})
         
+        # Workflow step names, derived once since the config does not change
+        if config.get('workflow'):
+            # Extract from explicit workflow definition
+            self._workflow_steps = [step.get('name', f'step_{i+1}') for i, step in enumerate(config['workflow'])]
+        else:
+            # Extract from scripts section
+            self._workflow_steps = list(self.scripts.keys())
+        
         # Create directories for job scripts and logs
         os.makedirs(self.scripts_dir, exist_ok=True)
         os.makedirs(self.logs_dir, exist_ok=True)
@@ -40,6 +62,16 @@ class JobScheduler:
         if batch_range:
             self.min_batch_id, self.max_batch_id = batch_range
             
+        # Cache of exit_status.log path -> (mtime_ns, content) to avoid re-reading unchanged files
+        self._exit_status_cache = {}
+        
+        # (path, mtime_ns, text) of the last custom SLURM template read by create_job_script
+        self._slurm_template_cache = None
+        
+        # Most recent queue snapshot as (monotonic time, job IDs), shared by callers within one poll cycle
+        self._queue_cache = None
+        self.queue_cache_ttl = config.get('scheduler', {}).get('queue_cache_ttl', 5)
+        
         # Dictionary to track batch_id to job_id mapping
         self.batch_job_map = {}
         
@@ -134,10 +166,8 @@ class JobScheduler:
         os.makedirs(batch_output_dir, exist_ok=True)
         
         # Start with custom template if provided, otherwise use default template
-        if 'slurm_template' in self.templates and os.path.exists(self.templates['slurm_template']):
-            with open(self.templates['slurm_template'], 'r') as f:
-                script_content = f.read()
-                
+        script_content = self._read_slurm_template()
+        if script_content is not None:
             # Replace template variables
             replacements = {
                 '${BATCH_NUMBER}': str(batch_id),
@@ -160,6 +190,28 @@ class JobScheduler:
         
         return script_path
     
+    def _read_slurm_template(self) -> Optional[str]:
+        """
+        Read the custom SLURM template, reusing the text while the file is unchanged
+        
+        Returns:
+            Template text, or None if no template is configured or the file does not exist
+        """
+        template_path = self.templates.get('slurm_template')
+        if not template_path:
+            return None
+        try:
+            mtime = os.stat(template_path).st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self._slurm_template_cache
+        if cached is None or cached[:2] != (template_path, mtime):
+            with open(template_path, 'r') as f:
+                cached = (template_path, mtime, f.read())
+            self._slurm_template_cache = cached
+        return cached[2]
+    
     def _create_default_job_script(self, 
                                    batch_id: int, 
                                    batch_files: List[str], 
@@ -687,59 +739,123 @@ class JobScheduler:
             print(f"[DRY RUN] To submit manually: sbatch {script_path}")
             return "dry-run"
         
-        try:
-            print(f"Submitting job script: {script_path}")
-            result = subprocess.run(['sbatch', script_path], 
-                                   check=True, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE,
-                                   universal_newlines=True)
-            # Extract job ID from sbatch output (usually something like "Submitted batch job 123456")
-            output = result.stdout.strip()
-            if "Submitted batch job" in output:
-                job_id = output.split()[-1]
-                print(f"Job submitted successfully with ID: {job_id}")
-                
-                # Store batch_id to job_id mapping if batch_id is provided
-                if batch_id is not None:
-                    self.batch_job_map[job_id] = batch_id
-                    self._save_batch_job_map()
-                    
-                    # Update the job status CSV file with the new job
-                    self.update_job_status_csv(job_id=job_id, batch_id=batch_id, 
-                                             force_resubmission=force_resubmission)
-                    
-                return job_id        
+        print(f"Submitting job script: {script_path}")
+        return self._handle_sbatch_result(self._run_sbatch(script_path), batch_id, force_resubmission)
+    
+    def submit_jobs(self, submissions: List[Tuple[str, int]]) -> List[Optional[str]]:
+        """
+        Submit several job scripts, running their sbatch calls concurrently
+        
+        Only the sbatch calls overlap; the batch/job mapping and the job status file are
+        updated for each job in turn, in the order the scripts were given.
+        
+        Args:
+            submissions: (job script path, batch ID) pairs
             
-            print(f"Job submission output: {output}")
-            return None
+        Returns:
+            Job ID for each submission, or None where it failed
+        """
+        if not submissions:
+            return []
+        max_workers = min(self.MAX_PARALLEL_SUBMISSIONS, len(submissions))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._run_sbatch, [script_path for script_path, _ in submissions]))
+        
+        job_ids = []
+        for (script_path, batch_id), result in zip(submissions, results):
+            print(f"Submitting job script: {script_path}")
+            job_ids.append(self._handle_sbatch_result(result, batch_id))
+        return job_ids
+    
+    def _run_sbatch(self, script_path: str) -> Union[subprocess.CompletedProcess, subprocess.CalledProcessError]:
+        """
+        Run sbatch for a job script
+        
+        Args:
+            script_path: Path to the job script
             
+        Returns:
+            The completed process, or the error if sbatch failed
+        """
+        try:
+            return subprocess.run(['sbatch', script_path], 
+                                  check=True, 
+                                  stdout=subprocess.PIPE, 
+                                  stderr=subprocess.PIPE,
+                                  universal_newlines=True)
         except subprocess.CalledProcessError as e:
-            print(f"Failed to submit job: {e}")
-            print(f"stderr: {e.stderr}")
+            return e
+    
+    def _handle_sbatch_result(self, result: Union[subprocess.CompletedProcess, subprocess.CalledProcessError],
+                              batch_id: Optional[int] = None,
+                              force_resubmission: bool = False) -> Optional[str]:
+        """
+        Extract the job ID from an sbatch call and record the submitted job
+        
+        Args:
+            result: Result of _run_sbatch
+            batch_id: The batch ID associated with this job
+            force_resubmission: If True, clear any existing entries for this batch ID
+            
+        Returns:
+            Job ID if submission was successful, None otherwise
+        """
+        if isinstance(result, subprocess.CalledProcessError):
+            print(f"Failed to submit job: {result}")
+            print(f"stderr: {result.stderr}")
             return None
+        
+        # Extract job ID from sbatch output (usually something like "Submitted batch job 123456")
+        output = result.stdout.strip()
+        if "Submitted batch job" in output:
+            job_id = output.split()[-1]
+            print(f"Job submitted successfully with ID: {job_id}")
+            
+            # The queue snapshot no longer includes every job we submitted
+            self._queue_cache = None
+            
+            # Store batch_id to job_id mapping if batch_id is provided
+            if batch_id is not None:
+                self.batch_job_map[job_id] = batch_id
+                self._save_batch_job_map()
+                
+                # Update the job status CSV file with the new job
+                self.update_job_status_csv(job_id=job_id, batch_id=batch_id, 
+                                         force_resubmission=force_resubmission)
+                
+            return job_id        
+        
+        print(f"Job submission output: {output}")
+        return None
     
-    def get_job_status(self, job_id: str, batch_output_dir: Optional[str] = None) -> str:
+    def get_job_status(self, job_id: str, batch_output_dir: Optional[str] = None,
+                       queue_jobs: Optional[Set[str]] = None,
+                       sacct_states: Optional[Dict[str, str]] = None,
+                       queue_states: Optional[Dict[str, str]] = None) -> str:
         """
         Get the status of a SLURM job or check exit_status.log if available.
 
         Args:
             job_id: SLURM job ID
             batch_output_dir: Directory containing exit_status.log (optional)
+            queue_jobs: Snapshot of job IDs currently in the queue (optional). Jobs not in
+                the snapshot skip the squeue call and go straight to sacct.
+            sacct_states: Accounting states fetched in bulk with get_bulk_job_states (optional).
+                Used instead of per-job squeue and sacct calls for the jobs it contains.
+            queue_states: Queue states fetched in bulk with get_bulk_queue_states (optional).
+                Used instead of a per-job squeue call for the jobs it contains.
 
         Returns:
             Job status (PENDING, RUNNING, COMPLETED, FAILED, etc.) or 'UNKNOWN' if job not found
         """
         # Check exit_status.log in the batch's subfolder
         if batch_output_dir:
-            exit_status_file = os.path.join(batch_output_dir, "exit_status.log")
-            if os.path.exists(exit_status_file):
-                with open(exit_status_file, "r") as f:
-                    status = f.read().strip()
-                    if status == "0":
-                        return "COMPLETED"
-                    else:
-                        return "FAILED"
+            status = self._read_exit_status(os.path.join(batch_output_dir, "exit_status.log"))
+            if status is not None:
+                if status == "0":
+                    return "COMPLETED"
+                else:
+                    return "FAILED"
 
         # Fallback to SLURM commands
         # Ensure job_id is a string
@@ -750,15 +866,26 @@ class JobScheduler:
             return "DRY-RUN"
             
         try:
-            result = subprocess.run(['squeue', '--job', job_id, '--format=%T', '--noheader'],
-                                   check=True,
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE,
-                                   universal_newlines=True)
+            output = ''
+            if queue_states is not None and job_id in queue_states:
+                # Already looked up in bulk
+                output = queue_states[job_id]
+            elif sacct_states is not None and job_id in sacct_states:
+                # Left the queue and already looked up in bulk
+                return sacct_states[job_id]
+            elif queue_jobs is None or job_id in queue_jobs:
+                result = subprocess.run(['squeue', '--job', job_id, '--format=%T', '--noheader'],
+                                       check=True,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE,
+                                       universal_newlines=True)
+                output = result.stdout.strip()
             
-            output = result.stdout.strip()
             if output:
                 return output
+            elif sacct_states is not None and queue_jobs is not None and job_id not in queue_jobs:
+                # Already looked up in bulk
+                return sacct_states.get(job_id, 'UNKNOWN')
             else:
                 # If no output, check if job completed or failed
                 sacct_result = subprocess.run(
@@ -780,6 +907,95 @@ class JobScheduler:
         except subprocess.CalledProcessError:
             return 'UNKNOWN'
     
+    def get_bulk_queue_states(self, job_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the queue state of several jobs with a single squeue call
+        
+        Args:
+            job_ids: SLURM job IDs
+            
+        Returns:
+            Dictionary of job ID -> state (jobs no longer in the queue are left out)
+        """
+        states = {}
+        if not job_ids:
+            return states
+        try:
+            result = subprocess.run(
+                ['squeue', '--job', ','.join(job_ids), '--format=%i|%T', '--noheader'],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return states
+        for line in result.stdout.splitlines():
+            queue_job_id, _, state = line.strip().partition('|')
+            if state:
+                states[queue_job_id] = state
+        return states
+    
+    def get_bulk_job_states(self, job_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the accounting state of several jobs with a single sacct call
+        
+        Args:
+            job_ids: SLURM job IDs
+            
+        Returns:
+            Dictionary of job ID -> state (jobs unknown to sacct are left out)
+        """
+        states = {}
+        if not job_ids:
+            return states
+        try:
+            result = subprocess.run(
+                ['sacct', '-j', ','.join(job_ids), '--format=JobID,State', '--noheader', '--parsable2'],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return states
+        for line in result.stdout.splitlines():
+            sacct_job_id, _, state = line.partition('|')
+            # Skip job steps (like 123.batch or 123.extern); keep the first state of each job
+            if state and '.' not in sacct_job_id:
+                states.setdefault(sacct_job_id, state)
+        return states
+    
+    def _read_exit_status(self, exit_status_file: str) -> Optional[str]:
+        """
+        Read an exit_status.log file, reusing the cached content while the file is unchanged
+        
+        A successful exit status ("0") is final, so once seen the file is not even stat'ed again.
+        
+        Args:
+            exit_status_file: Path to the exit_status.log file
+            
+        Returns:
+            The stripped file content, or None if the file does not exist
+        """
+        cached = self._exit_status_cache.get(exit_status_file)
+        if cached is not None and cached[1] == '0':
+            return cached[1]
+        
+        try:
+            mtime_ns = os.stat(exit_status_file).st_mtime_ns
+        except OSError:
+            self._exit_status_cache.pop(exit_status_file, None)
+            return None
+        
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with open(exit_status_file, 'r') as f:
+            exit_status = f.read().strip()
+        self._exit_status_cache[exit_status_file] = (mtime_ns, exit_status)
+        return exit_status
+    
     def get_batch_id_for_job(self, job_id: str) -> Optional[int]:
         """
         Get the batch ID associated with a job ID
@@ -852,15 +1068,7 @@ class JobScheduler:
                 return "partially_complete"
                 
             # Get workflow steps from config
-            workflow_steps = []
-            
-            # Try to extract workflow stages in different ways depending on config structure
-            if 'workflow' in self.config and self.config['workflow']:
-                # Extract from explicit workflow definition
-                workflow_steps = [step.get('name', f'step_{i+1}') for i, step in enumerate(self.config['workflow'])]
-            elif 'scripts' in self.config and self.config['scripts']:
-                # Extract from scripts section
-                workflow_steps = list(self.config['scripts'].keys())
+            workflow_steps = self._workflow_steps
             
             # Use default steps if none found in config
             if not workflow_steps:
@@ -873,24 +1081,18 @@ class JobScheduler:
             # For each workflow step, check its exit status file
             for step in workflow_steps:
                 step_dir = os.path.join(batch_output_dir, step)
-                exit_status_file = os.path.join(step_dir, 'exit_status.log')
                 
-                # If the directory doesn't exist, this step wasn't reached
-                if not os.path.exists(step_dir):
-                    continue
-                    
-                # Check if exit status file exists and read its content
-                if os.path.exists(exit_status_file):
-                    try:
-                        with open(exit_status_file, 'r') as f:
-                            exit_status = f.read().strip()
-                            if exit_status == '0':
-                                # Step completed successfully
-                                completed_steps.append(step)
-                                last_successful_step = step
-                    except:
-                        # If we can't read the file, consider the step didn't complete
-                        pass
+                # Check the exit status file; if it (or the step directory) doesn't exist,
+                # this step wasn't reached or didn't complete
+                try:
+                    exit_status = self._read_exit_status(os.path.join(step_dir, 'exit_status.log'))
+                except OSError:
+                    # If we can't read the file, consider the step didn't complete
+                    exit_status = None
+                if exit_status == '0':
+                    # Step completed successfully
+                    completed_steps.append(step)
+                    last_successful_step = step
             
             # If we found completed steps, report the last one
             if last_successful_step:
@@ -905,15 +1107,7 @@ class JobScheduler:
             return "initializing"
             
         # Get workflow steps from config
-        workflow_steps = []
-        
-        # Try to extract workflow stages in different ways depending on config structure
-        if 'workflow' in self.config and self.config['workflow']:
-            # Extract from explicit workflow definition
-            workflow_steps = [step.get('name', f'step_{i+1}') for i, step in enumerate(self.config['workflow'])]
-        elif 'scripts' in self.config and self.config['scripts']:
-            # Extract from scripts section
-            workflow_steps = list(self.config['scripts'].keys())
+        workflow_steps = self._workflow_steps
         
         #Raise error if no workflow steps found
         assert workflow_steps, "No workflow steps defined in configuration"
@@ -921,23 +1115,21 @@ class JobScheduler:
         # Check for latest stage in reverse order (latest to earliest)
         for step in reversed(workflow_steps):
             step_dir = os.path.join(batch_output_dir, step)
-            exit_status_file = os.path.join(step_dir, 'exit_status.log')
             
             # If directory exists, this stage has started
             if os.path.exists(step_dir):
-                if os.path.exists(exit_status_file):
-                    # Check exit status to see if step completed
-                    try:
-                        with open(exit_status_file, 'r') as f:
-                            exit_code = f.read().strip()
-                            if exit_code == '0':
-                                # Step completed successfully, continuing to next one
-                                continue
-                            else:
-                                # Step failed
-                                return f"{step} (failed)"
-                    except:
-                        pass
+                # Check exit status to see if step completed
+                try:
+                    exit_code = self._read_exit_status(os.path.join(step_dir, 'exit_status.log'))
+                except OSError:
+                    exit_code = None
+                if exit_code is not None:
+                    if exit_code == '0':
+                        # Step completed successfully, continuing to next one
+                        continue
+                    else:
+                        # Step failed
+                        return f"{step} (failed)"
                         
                 # Stage directory exists but no exit status or non-zero status
                 # Check for specific activity indicators within the stage
@@ -971,7 +1163,8 @@ class JobScheduler:
         # If no stage directories found but job is running
         return "preparing"
 
-    def update_job_status_csv(self, job_id: str = None, batch_id: int = None, force_resubmission: bool = False):
+    def update_job_status_csv(self, job_id: str = None, batch_id: int = None, force_resubmission: bool = False,
+                              queue_jobs: Optional[Set[str]] = None):
         """
         Update the job_status.csv file with current job statuses.
         If job_id and batch_id are provided, update only that job.
@@ -981,12 +1174,30 @@ class JobScheduler:
             job_id: Specific job ID to update (optional)
             batch_id: Specific batch ID to update (optional)
             force_resubmission: If True, clear any existing entries for this batch ID (for resubmission)
+            queue_jobs: Snapshot of job IDs currently in the queue, see get_job_status (optional)
+        """
+        csv_file = os.path.join(self.output_path, 'job_status.csv')
+        
+        # Hold the job status lock from the read to the rewrite so rows that the tracker
+        # appends in between are not lost
+        with file_lock(csv_file):
+            self._update_job_status_csv_locked(csv_file, job_id, batch_id, force_resubmission, queue_jobs)
+    
+    def _update_job_status_csv_locked(self, csv_file: str, job_id: Optional[str], batch_id: Optional[int],
+                                      force_resubmission: bool, queue_jobs: Optional[Set[str]]):
+        """
+        Update the job_status.csv file while holding its lock, see update_job_status_csv
+        
+        Args:
+            csv_file: Path to the job status CSV file
+            job_id: Specific job ID to update (optional)
+            batch_id: Specific batch ID to update (optional)
+            force_resubmission: If True, clear any existing entries for this batch ID (for resubmission)
+            queue_jobs: Snapshot of job IDs currently in the queue, see get_job_status (optional)
         """
         import csv
         import time
         
-        csv_file = os.path.join(self.output_path, 'job_status.csv')
-        
         # Read existing data if file exists
         job_data = {}
         
@@ -1054,13 +1265,32 @@ class JobScheduler:
                 formatted_time = self._format_datetime(current_time)
                 job_data[batch_id_str] = [batch_id_str, job_id, status, formatted_time, '', workflow_stage]
         else:
+            # Jobs that left the queue without an exit status are looked up with one sacct call
+            sacct_states = None
+            if queue_jobs is not None:
+                results_dir = self.config['output']['results_dir']
+                sacct_job_ids = [
+                    job_id for job_id, batch_id in self.batch_job_map.items()
+                    if job_id != "dry-run" and job_id not in queue_jobs and self._read_exit_status(
+                        os.path.join(results_dir, f'batch_{batch_id}', 'exit_status.log')) is None
+                ]
+                sacct_states = self.get_bulk_job_states(sacct_job_ids)
+            
+            # Jobs still in the queue are looked up with one squeue call
+            queue_states = None
+            if queue_jobs is not None:
+                queue_states = self.get_bulk_queue_states(
+                    [job_id for job_id in self.batch_job_map if job_id in queue_jobs])
+            
             # Update all jobs in the batch_job_map
             for job_id, batch_id in self.batch_job_map.items():
                 batch_id_str = str(batch_id)
                 
                 # Get batch output directory to check for exit_status.log
                 batch_output_dir = os.path.join(self.config['output']['results_dir'], f'batch_{batch_id}')
-                status = self.get_job_status(job_id, batch_output_dir if os.path.exists(batch_output_dir) else None)
+                status = self.get_job_status(job_id, batch_output_dir if os.path.exists(batch_output_dir) else None,
+                                             queue_jobs=queue_jobs, sacct_states=sacct_states,
+                                             queue_states=queue_states)
                 
                 # Get the workflow stage - always calculate this for every job
                 workflow_stage = self._get_current_workflow_stage(batch_id, status)
@@ -1080,14 +1310,16 @@ class JobScheduler:
                     formatted_time = self._format_datetime(current_time)
                     job_data[batch_id_str] = [batch_id_str, job_id, status, formatted_time, '', workflow_stage]
         
-        # Write updated data back to CSV
-        with open(csv_file, 'w', newline='') as f:
+        # Write updated data back to CSV via a temporary file and an atomic rename
+        tmp_file = f"{csv_file}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
+        with open(tmp_file, 'w', newline='') as f:
             writer = csv.writer(f)
             # Write header with workflow_stage column
             writer.writerow(['batch_id', 'job_id', 'status', 'submission_time', 'completion_time', 'workflow_stage'])
             # Write data
             for row in job_data.values():
                 writer.writerow(row)
+        os.replace(tmp_file, csv_file)
         
         # Verify the workflow stage was properly written - useful for debugging
         if job_id and batch_id:
@@ -1099,81 +1331,93 @@ class JobScheduler:
         This is useful for periodic status updates and fixing missing workflow stage entries.
         
         Returns:
-            Dict of batch_id -> status for monitoring
+            Tuple of (dict of batch_id -> status for monitoring, job status DataFrame or None
+            if the status file could not be read)
         """
-        # Load latest batch-job mappings
-        self._load_batch_job_map()
+        # Start the queue query in the background so it overlaps with the local file I/O
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            queue_future = executor.submit(self.get_queue_jobs)
+            
+            # Load latest batch-job mappings
+            self._load_batch_job_map()
+            
+            try:
+                queue_jobs = queue_future.result(timeout=30)
+            except Exception as e:
+                print(f"Warning: Could not get queue snapshot: {e}")
+                queue_jobs = None
         
         # First update the CSV with fresh status information from the job scheduler
-        self.update_job_status_csv()
+        self.update_job_status_csv(queue_jobs=queue_jobs)
         
         # Now fix any entries with missing workflow stage directly
         csv_file = os.path.join(self.output_path, 'job_status.csv')
         
+        df = None
         if os.path.exists(csv_file):
             import pandas as pd
             
             try:
-                # Read the CSV into a pandas DataFrame for easier manipulation
-                df = pd.read_csv(csv_file)
+                # Read the CSV into a pandas DataFrame for easier manipulation; the few distinct
+                # workflow stages are stored as a category so comparisons are cheap
+                df = pd.read_csv(csv_file, dtype={'workflow_stage': 'category'})
+                
+                # The tracker appends updated rows, so keep only the last row of each job
+                deduplicated = df.drop_duplicates(['batch_id', 'job_id'], keep='last', ignore_index=True)
+                updated_rows = len(deduplicated) != len(df)
+                df = deduplicated
                 
                 # Check if workflow_stage column exists, add it if not
                 if 'workflow_stage' not in df.columns:
-                    df['workflow_stage'] = ''
+                    df['workflow_stage'] = pd.Categorical([None] * len(df))
+                    updated_rows = True
                     print("Added missing workflow_stage column to job status file")
+                elif not isinstance(df['workflow_stage'].dtype, pd.CategoricalDtype):
+                    df['workflow_stage'] = df['workflow_stage'].astype('category')
                 
-                # Check for and fix missing workflow stage values
-                updated_rows = False
-                
-                for index, row in df.iterrows():
-                    # Check if workflow_stage is empty or NaN
-                    if pd.isna(row['workflow_stage']) or row['workflow_stage'] == '':
-                        batch_id = int(row['batch_id'])
-                        status = row['status']
-                        
-                        # Set workflow stage based on status directly
-                        if status == 'COMPLETED':
-                            workflow_stage = 'completed'
-                        elif status == 'PENDING':
-                            workflow_stage = 'pending'
-                        elif status == 'FAILED':
-                            workflow_stage = 'failed'
-                        elif status == 'CANCELLED':
-                            workflow_stage = 'cancelled'
-                        elif status == 'RUNNING':
-                            # For running jobs, get detailed workflow stage
-                            workflow_stage = self._get_current_workflow_stage(batch_id, status)
-                        else:
-                            workflow_stage = status.lower()
-                        
-                        # Update the workflow stage in the DataFrame
+                # Check for and fix missing workflow stage values (empty strings are read as NaN)
+                missing_stage = df['workflow_stage'].isna()
+                for index in df.index[missing_stage]:
+                    batch_id = int(df.at[index, 'batch_id'])
+                    status = df.at[index, 'status']
+                    
+                    # Set workflow stage based on status directly
+                    if status == 'COMPLETED':
+                        workflow_stage = 'completed'
+                    elif status == 'PENDING':
+                        workflow_stage = 'pending'
+                    elif status == 'FAILED':
+                        workflow_stage = 'failed'
+                    elif status == 'CANCELLED':
+                        workflow_stage = 'cancelled'
+                    elif status == 'RUNNING':
+                        # For running jobs, get detailed workflow stage
+                        workflow_stage = self._get_current_workflow_stage(batch_id, status)
+                    else:
+                        workflow_stage = status.lower()
+                    
+                    # Update the workflow stage in the DataFrame only if the value actually changes
+                    if df.at[index, 'workflow_stage'] != workflow_stage:
+                        if workflow_stage not in df['workflow_stage'].cat.categories:
+                            df['workflow_stage'] = df['workflow_stage'].cat.add_categories([workflow_stage])
                         df.at[index, 'workflow_stage'] = workflow_stage
                         updated_rows = True
                         print(f"Fixed workflow stage for batch {batch_id}: {status} → {workflow_stage}")
-                
+            
                 # Write back the updated DataFrame if any rows were changed
                 if updated_rows:
-                    df.to_csv(csv_file, index=False)
+                    atomic_write_csv(df, csv_file)
                     print(f"Updated job status file with workflow stage information")
             
             except Exception as e:
                 print(f"Error processing CSV for workflow stage updates: {e}")
         
-        # Return a dict of batch_id -> status for monitoring
+        # Return a dict of batch_id -> status for monitoring, built from the table read above
         statuses = {}
-        if os.path.exists(csv_file):
-            try:
-                import csv
-                with open(csv_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        batch_id = row['batch_id']
-                        status = row['status']
-                        statuses[batch_id] = status
-            except Exception as e:
-                print(f"Error reading job statuses: {e}")
+        if df is not None:
+            statuses = dict(zip(df['batch_id'].astype(str), df['status']))
         
-        return statuses
+        return statuses, df
 
     def monitor_jobs(self, update_interval: int = 60, max_updates: int = -1):
         """
@@ -1190,13 +1434,11 @@ class JobScheduler:
         try:
             while max_updates == -1 or updates < max_updates:
                 print(f"Updating job statuses... (update #{updates+1})")
-                statuses = self.refresh_all_job_statuses()
+                statuses, df = self.refresh_all_job_statuses()
                 
                 # Print current statuses with improved formatting
-                csv_file = os.path.join(self.output_path, 'job_status.csv')
-                if os.path.exists(csv_file):
+                if df is not None:
                     try:
-                        df = pd.read_csv(csv_file)
                         if not df.empty:
                             print(f"\nCurrently tracked jobs: {len(df)}")
                             
@@ -1213,13 +1455,13 @@ class JobScheduler:
                             active_jobs = df[df['status'].isin(['RUNNING', 'PENDING'])]
                             if not active_jobs.empty:
                                 print("\nActive jobs:")
-                                for _, job in active_jobs.iterrows():
-                                    submission_time = job['submission_time']
+                                lines = []
+                                for job in active_jobs.to_dict('records'):
                                     # Include workflow stage if available
-                                    if 'workflow_stage' in df.columns and not pd.isna(job['workflow_stage']):
-                                        print(f"  - Batch {job['batch_id']}: Job ID {job['job_id']} ({job['status']} - {job['workflow_stage']}, submitted: {submission_time})")
-                                    else:
-                                        print(f"  - Batch {job['batch_id']}: Job ID {job['job_id']} ({job['status']}, submitted: {submission_time})")
+                                    stage = job.get('workflow_stage')
+                                    status = job['status'] if pd.isna(stage) else f"{job['status']} - {stage}"
+                                    lines.append(f"  - Batch {job['batch_id']}: Job ID {job['job_id']} ({status}, submitted: {job['submission_time']})")
+                                sys.stdout.write('\n'.join(lines) + '\n')
                     except Exception as e:
                         print(f"Error reading job status CSV: {e}")
                 
@@ -1231,29 +1473,50 @@ class JobScheduler:
             print("\nJob monitoring stopped by user.")
             return
 
-    def get_queue_jobs(self) -> Set[str]:
+    def get_queue_jobs(self, timeout: float = 30, max_age: Optional[float] = None) -> Set[str]:
         """
         Get a set of all job IDs currently in the scheduler queue
 
+        Args:
+            timeout: Seconds to wait for the queue command before giving up
+            max_age: Reuse the previous snapshot if it is younger than this many seconds
+                (defaults to the scheduler's queue_cache_ttl; 0 always queries the scheduler)
+
         Returns:
             A set of job ID strings currently in the queue
         """
+        if max_age is None:
+            max_age = self.queue_cache_ttl
+        if self._queue_cache is not None and time.monotonic() - self._queue_cache[0] < max_age:
+            return self._queue_cache[1]
+        
         queue_jobs = set()
+        queried_at = time.monotonic()
         
         # Logic depends on scheduler type
         scheduler_type = self.config.get("scheduler", {}).get("type", "slurm").lower()
         
         try:
             if scheduler_type == "slurm":
-                # Get all jobs from squeue
-                result = subprocess.run(['squeue', '-h', '-o', '%i'], 
-                                      stdout=subprocess.PIPE, 
-                                      stderr=subprocess.PIPE,
-                                      universal_newlines=True)
-                if result.returncode == 0:
-                    for line in result.stdout.strip().split('\n'):
-                        if line.strip():
-                            queue_jobs.add(line.strip())
+                # Get all jobs from squeue, reading job IDs as they are streamed
+                proc = subprocess.Popen(['squeue', '-h', '-o', '%i'],
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL,
+                                        universal_newlines=True)
+                # Kill squeue if it hangs so the tracker is never blocked indefinitely
+                killer = threading.Timer(timeout, proc.kill)
+                killer.start()
+                try:
+                    for line in proc.stdout:
+                        line = line.strip()
+                        if line:
+                            queue_jobs.add(line)
+                    proc.wait()
+                finally:
+                    killer.cancel()
+                    proc.stdout.close()
+                if proc.returncode != 0:
+                    queue_jobs = set()
                 
             elif scheduler_type == "pbs" or scheduler_type == "torque":
                 # Get all jobs from qstat
@@ -1262,11 +1525,13 @@ class JobScheduler:
                                        stderr=subprocess.PIPE,
                                        universal_newlines=True)
                 if result.returncode == 0:
-                    # Parse PBS/Torque qstat output to extract job IDs
-                    job_id_pattern = r'Job Id:\s*(\d+)'
-                    matches = re.finditer(job_id_pattern, result.stdout)
-                    for match in matches:
-                        queue_jobs.add(match.group(1))
+                    # Parse PBS/Torque qstat output to extract the numeric part of each job ID
+                    # (e.g. "Job Id: 12345.server" -> "12345")
+                    for line in result.stdout.splitlines():
+                        if line.startswith('Job Id:'):
+                            job_id = line[7:].strip().split('.', 1)[0]
+                            if job_id.isdigit():
+                                queue_jobs.add(job_id)
             
             elif scheduler_type == "lsf":
                 # Get all jobs from bjobs
@@ -1281,6 +1546,8 @@ class JobScheduler:
             
             else:
                 print(f"Warning: Unsupported scheduler type '{scheduler_type}' for queue check")
+            
+            self._queue_cache = (queried_at, queue_jobs)
                 
         except (subprocess.SubprocessError, FileNotFoundError) as e:
             print(f"Error checking queue: {e}")
@@ -1299,13 +1566,16 @@ def resolve_installed_script_and_type(module_path: str):
         return None, None
 
     # Find the installed location of the root package
-    try:
-        spec = importlib.util.find_spec(parts[0])
-        if not spec or not spec.submodule_search_locations:
+    if parts[0] == _PKG_NAME:
+        package_dir = _PKG_DIR
+    else:
+        try:
+            spec = importlib.util.find_spec(parts[0])
+            if not spec or not spec.submodule_search_locations:
+                return None, None
+            package_dir = list(spec.submodule_search_locations)[0]
+        except Exception:
             return None, None
-        package_dir = list(spec.submodule_search_locations)[0]
-    except Exception:
-        return None, None
 
     # Build the relative path under the package
     rel_path = os.path.join(*parts[1:])
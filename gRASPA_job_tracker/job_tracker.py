@@ -1,19 +1,66 @@
+import concurrent.futures
+import csv
+import io
 import os
 import time
 import subprocess
 import requests
 import shutil
+import threading
+import uuid
+from collections import ChainMap, Counter, deque
+from contextlib import contextmanager
 from urllib.parse import urlparse
 from tqdm import tqdm
-from typing import Dict, List, Any, Set, Optional, Union, Tuple
+from tqdm.utils import CallbackIOWrapper
+from typing import Dict, Iterator, List, Any, Set, Optional, Union, Tuple
+import numpy as np
 import pandas as pd
 
 from .batch_manager import BatchManager
 from .job_scheduler import JobScheduler
+from .utils import atomic_write_csv, file_lock, is_dir_empty
+
+# pyarrow is optional; when available it is used to load large job status files
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 class JobTracker:
     """Track job progress and manage job submission"""
     
+    # Columns of job_status.csv
+    JOB_STATUS_COLUMNS = ['batch_id', 'job_id', 'status', 'submission_time', 'completion_time', 'workflow_stage']
+    
+    # Known job statuses, stored as a categorical column (other values are added as they appear)
+    STATUS_CATEGORIES = ['PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'PARTIALLY_COMPLETE',
+                         'CANCELLED', 'TIMEOUT', 'UNKNOWN', 'DRY-RUN']
+    STATUS_DTYPE = pd.CategoricalDtype(STATUS_CATEGORIES)
+    
+    # Column types of an empty job status table
+    JOB_STATUS_DTYPES = {
+        'batch_id': 'int64',
+        'job_id': 'int64',
+        'status': STATUS_DTYPE,
+        'submission_time': 'datetime64[ns]',
+        'completion_time': 'datetime64[ns]',
+        'workflow_stage': 'category'
+    }
+    
+    # Statuses of jobs that are still queued or running
+    ACTIVE_STATUSES = ('RUNNING', 'PENDING')
+    
+    # Job status files larger than this are loaded with the multi-threaded pyarrow reader if available
+    PYARROW_MIN_FILE_SIZE = 1024 * 1024
+    
+    # Number of trailing bytes remembered to detect whether the job status file was only appended to
+    TAIL_SIGNATURE_SIZE = 256
+    
+    # The job status file is compacted once it holds this many rows per tracked job
+    COMPACTION_RATIO = 10
+    
     def __init__(self, config: Dict[str, Any], batch_range: Optional[Tuple[int, int]] = None):
         """
         Initialize the job tracker
@@ -24,8 +71,9 @@ class JobTracker:
         """
         self.config = config
         
-        # Store batch range
+        # Store batch range, with its bounds unpacked once (None means unbounded)
         self.batch_range = batch_range
+        self._min_batch, self._max_batch = batch_range or (None, None)
         
         # Use output structure from config
         self.output_path = config['output']['output_dir']
@@ -33,23 +81,80 @@ class JobTracker:
         
         self.max_concurrent_jobs = config['batch'].get('max_concurrent_jobs', 1)
         
+        # Cap on tracked PENDING/RUNNING jobs checked by run_single_cif, which is not bound
+        # by max_concurrent_jobs, and by submit_next_job (None disables the cap)
+        self.max_pending_jobs = config['batch'].get('max_pending_jobs', 100000)
+        
         # Control whether failed jobs should be resubmitted
         self.resubmit_failed = config['batch'].get('resubmit_failed', False)
         
+        # Pause submissions while more than max_failure_rate of the last failure_window
+        # finished jobs failed (None disables the check)
+        self.max_failure_rate = config['batch'].get('max_failure_rate', 0.5)
+        self._recent_outcomes = deque(maxlen=config['batch'].get('failure_window', 20))
+        
         # Initialize batch manager and job scheduler
         self.batch_manager = BatchManager(config)
         self.job_scheduler = JobScheduler(config, batch_range=batch_range)
         
+        # Workflow step names are fixed for the tracker's lifetime; share the scheduler's list
+        self._workflow_steps = self.job_scheduler._workflow_steps
+        
         # Create tracking files and directories
         os.makedirs(self.output_path, exist_ok=True)
         os.makedirs(self.results_dir, exist_ok=True)
         
         self.job_status_file = os.path.join(self.output_path, 'job_status.csv')
         self.failed_batches_file = os.path.join(self.output_path, 'failed_batches.txt')
+        self.failed_batches_log_file = f"{self.failed_batches_file}.log"
+        
+        # Set while the polling loop runs so status saves are coalesced into flush()
+        self._defer_saves = False
+        
+        # (mtime, size) of the job status file as last read or written by this tracker
+        self._job_status_file_state = None
+        
+        # Appended rows wait here as plain dicts until the table is next read (see job_status)
+        self._row_buffer = []
+        
+        # (epoch second, Timestamp) returned by the last _format_timestamp call
+        self._last_timestamp = None
+        
+        # Set by wake() to end the polling loop's wait early
+        self._wake = threading.Event()
+        
+        # JobScheduler writing into singles/temp_scripts, built by the first run_single_cif call
+        self._single_cif_scheduler = None
         
         # Initialize or load job status tracking
         self._initialize_job_status()
     
+    @property
+    def job_status(self) -> pd.DataFrame:
+        """Job status table, including any rows appended since it was last read"""
+        if self._row_buffer:
+            self._materialize_pending_rows()
+        return self._job_status
+    
+    @job_status.setter
+    def job_status(self, df: pd.DataFrame):
+        self._job_status = df
+        self._row_buffer = []
+    
+    def _materialize_pending_rows(self):
+        """Add all buffered rows to the job status table with a single concat"""
+        rows, self._row_buffer = self._row_buffer, []
+        for column in ('status', 'workflow_stage'):
+            self._ensure_categories(column, [row[column] for row in rows if column in row])
+        dtypes = self._job_status.dtypes.to_dict()
+        if any(isinstance(row.get('job_id'), str) for row in rows):
+            # A "dry-run" job ID cannot be cast to an integer column
+            dtypes['job_id'] = object
+        # Build each column directly in the table's dtype so concat has nothing to reconcile
+        new_df = pd.DataFrame({column: pd.array([row.get(column) for row in rows], dtype=dtypes[column])
+                               for column in self._job_status.columns})
+        self._job_status = pd.concat([self._job_status, new_df], ignore_index=True)
+    
     def _format_timestamp(self) -> pd.Timestamp:
         """
         Create a timestamp without fractional seconds
@@ -57,81 +162,584 @@ class JobTracker:
         Returns:
             A pandas Timestamp object with second precision
         """
-        # Get current time
-        current_time = pd.Timestamp(time.time(), unit='s')
-        # Format to string without microseconds and convert back to timestamp
-        time_str = current_time.strftime('%Y-%m-%d %H:%M:%S')
-        return pd.Timestamp(time_str)
+        # Truncating the epoch seconds drops the fraction without a string round trip;
+        # every call within the same second gets the same value, so reuse the last one
+        seconds = int(time.time())
+        if self._last_timestamp is None or self._last_timestamp[0] != seconds:
+            self._last_timestamp = (seconds, pd.Timestamp(seconds, unit='s'))
+        return self._last_timestamp[1]
+    
+    def _read_job_status(self) -> pd.DataFrame:
+        """
+        Read the job status file with explicit column types
+        
+        Updated rows are appended to the file, so the same job can appear several times;
+        only its last row is kept.
+        
+        Returns:
+            DataFrame with the job status table
+        """
+        date_columns = ['submission_time', 'completion_time']
+        self._job_status_file_state = self._get_job_status_file_state()
+        self._job_status_tail = self._get_job_status_tail()
+        
+        # job_id is left to inference since it mixes numeric IDs with the "dry-run" marker
+        if HAS_PYARROW and os.path.getsize(self.job_status_file) >= self.PYARROW_MIN_FILE_SIZE:
+            with open(self.job_status_file, 'r') as f:
+                header = f.readline().strip().split(',')
+            df = pd.read_csv(self.job_status_file,
+                             usecols=[column for column in header if column in self.JOB_STATUS_COLUMNS],
+                             parse_dates=date_columns,
+                             engine='pyarrow')
+            # pyarrow parses timestamps with second resolution
+            df = df.astype({'batch_id': 'int64', 'submission_time': 'datetime64[ns]',
+                            'completion_time': 'datetime64[ns]'})
+        else:
+            df = pd.read_csv(self.job_status_file,
+                             usecols=lambda column: column in self.JOB_STATUS_COLUMNS,
+                             dtype={'batch_id': 'int64', 'status': 'category', 'workflow_stage': 'category'},
+                             parse_dates=date_columns,
+                             date_format='%Y-%m-%d %H:%M:%S',
+                             engine='c')
+            # Columns without any timestamp (e.g. a header-only file) are not converted by parse_dates
+            df = df.astype({'submission_time': 'datetime64[ns]', 'completion_time': 'datetime64[ns]'})
+        self._csv_columns = list(df.columns)
+        self._csv_row_count = len(df)
+        self._dirty_indices = set()
+        
+        deduplicated, superseded = self._deduplicate_job_status(df)
+        # Compact the file on the next save if it carries superseded rows
+        self._full_rewrite_needed = superseded
+        return self._categorize_job_status(deduplicated)
+    
+    def _deduplicate_job_status(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, bool]:
+        """
+        Keep only the last row of each job, at the position where the job was first recorded
+        
+        Args:
+            df: Job status rows in file order
+            
+        Returns:
+            Tuple of (deduplicated table with a fresh RangeIndex, whether any rows were dropped)
+        """
+        keys = ['batch_id', 'job_id']
+        deduplicated = df.drop_duplicates(keys, keep='last')
+        superseded = len(deduplicated) != len(df)
+        if superseded:
+            first_seen = df.drop_duplicates(keys).set_index(keys).index
+            deduplicated = deduplicated.set_index(keys).reindex(first_seen).reset_index()[df.columns]
+        return deduplicated.reset_index(drop=True), superseded
+    
+    def _get_job_status_tail(self) -> Optional[Tuple[int, int, bytes]]:
+        """
+        Get the inode, size and trailing bytes of the job status file
+        
+        Returns:
+            Tuple of (inode, size, last bytes), or None if the file doesn't exist
+        """
+        try:
+            with open(self.job_status_file, 'rb') as f:
+                st = os.fstat(f.fileno())
+                start = max(0, st.st_size - self.TAIL_SIGNATURE_SIZE)
+                f.seek(start)
+                return (st.st_ino, st.st_size, f.read(st.st_size - start))
+        except FileNotFoundError:
+            return None
+    
+    def _read_appended_job_status(self) -> Optional[pd.DataFrame]:
+        """
+        Merge only the rows appended to the job status file since it was last read
+        
+        Returns:
+            Updated job status table, or None if the file was rewritten rather than appended
+            to and has to be read in full
+        """
+        if self._job_status_tail is None:
+            return None
+        inode, offset, signature = self._job_status_tail
+        if not signature.endswith(b'\n'):
+            return None
+        
+        with open(self.job_status_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != inode or st.st_size < offset:
+                return None
+            # Rewrites in place would change the bytes we saw last time
+            f.seek(offset - len(signature))
+            if f.read(len(signature)) != signature:
+                return None
+            f.seek(0)
+            header = f.readline().decode().strip().split(',')
+            f.seek(offset)
+            appended = f.read(st.st_size - offset)
+        
+        # A writer may be half way through a row; leave it for the next refresh
+        appended = appended[:appended.rfind(b'\n') + 1]
+        new_offset = offset + len(appended)
+        self._job_status_tail = (inode, new_offset, (signature + appended)[-self.TAIL_SIGNATURE_SIZE:])
+        if not appended:
+            return self.job_status
+        
+        new_rows = pd.read_csv(io.BytesIO(appended), header=None, names=header,
+                               usecols=lambda column: column in self.JOB_STATUS_COLUMNS,
+                               dtype={'batch_id': 'int64', 'status': 'category', 'workflow_stage': 'category'},
+                               parse_dates=['submission_time', 'completion_time'],
+                               date_format='%Y-%m-%d %H:%M:%S',
+                               engine='c')
+        new_rows = new_rows.astype({'submission_time': 'datetime64[ns]', 'completion_time': 'datetime64[ns]'})
+        if list(new_rows.columns) != self._csv_columns or new_rows['job_id'].dtype != self.job_status['job_id'].dtype:
+            return None
+        self._csv_row_count += len(new_rows)
+        
+        # Give both frames the same categories so the concat keeps the categorical columns
+        # instead of falling back to object dtype
+        for column in ('status', 'workflow_stage'):
+            self._ensure_categories(column, new_rows[column].cat.categories)
+            new_rows[column] = new_rows[column].cat.set_categories(self.job_status[column].cat.categories)
+        merged = pd.concat([self.job_status, new_rows], ignore_index=True) if not self.job_status.empty else new_rows
+        merged, superseded = self._deduplicate_job_status(merged)
+        self._full_rewrite_needed = self._full_rewrite_needed or superseded
+        return self._categorize_job_status(merged)
+    
+    def _reload_job_status(self) -> pd.DataFrame:
+        """
+        Reload the job status file, parsing only appended rows when possible
+        
+        Returns:
+            DataFrame with the job status table
+        """
+        file_state = self._get_job_status_file_state()
+        df = self._read_appended_job_status()
+        if df is None:
+            return self._read_job_status()
+        self._job_status_file_state = file_state
+        return df
+    
+    def _categorize_job_status(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store the status and workflow_stage columns as categoricals to share repeated strings
+        
+        Args:
+            df: Job status table
+            
+        Returns:
+            The same table with categorical status and workflow_stage columns
+        """
+        parsed = isinstance(df['status'].dtype, pd.CategoricalDtype)
+        statuses = df['status'].cat.categories if parsed else df['status'].dropna().unique()
+        extra = sorted(set(statuses) - set(self.STATUS_CATEGORIES))
+        dtype = pd.CategoricalDtype(self.STATUS_CATEGORIES + extra) if extra else self.STATUS_DTYPE
+        if parsed:
+            # Parsed as categorical already: only the category codes are remapped
+            df['status'] = df['status'].cat.set_categories(dtype.categories)
+        else:
+            df['status'] = df['status'].astype(dtype)
+        if not isinstance(df['workflow_stage'].dtype, pd.CategoricalDtype):
+            df['workflow_stage'] = df['workflow_stage'].astype('category')
+        return df
+    
+    def _ensure_categories(self, column: str, values):
+        """
+        Add values missing from the categories of a categorical column
+        
+        Args:
+            column: Column name
+            values: Values about to be written to the column
+        """
+        dtype = self.job_status[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            missing = [value for value in set(values) if not pd.isna(value) and value not in dtype.categories]
+            if missing:
+                self.job_status[column] = self.job_status[column].cat.add_categories(missing)
     
     def _initialize_job_status(self):
         """Initialize or load job status tracking"""
         if os.path.exists(self.job_status_file):
-            self.job_status = pd.read_csv(self.job_status_file,
-                                          parse_dates=['submission_time', 'completion_time'])
+            self.job_status = self._read_job_status()
         else:
-            self.job_status = pd.DataFrame(columns=[
-                'batch_id', 'job_id', 'status', 'submission_time', 'completion_time', 'workflow_stage'
-            ])
+            # Build the empty table with its final column types directly
+            self.job_status = pd.DataFrame({column: pd.Series(dtype=self.JOB_STATUS_DTYPES[column])
+                                            for column in self.JOB_STATUS_COLUMNS})
             self.job_status.to_csv(self.job_status_file, index=False)
-            # Explicitly set the types
-            self.job_status = self.job_status.astype({
-                'batch_id': int,
-                'job_id': int,
-                'status': str,
-                'submission_time': 'datetime64[ns]',
-                'completion_time': 'datetime64[ns]',
-                'workflow_stage': str
-            })
-        # Initialize failed batches list
-        if os.path.exists(self.failed_batches_file):
-            with open(self.failed_batches_file, 'r') as f:
-                self.failed_batches = set(int(line.strip()) for line in f if line.strip())
+            self._job_status_file_state = self._get_job_status_file_state()
+            self._job_status_tail = self._get_job_status_tail()
+            self._csv_columns = list(self.JOB_STATUS_COLUMNS)
+            self._csv_row_count = 0
+            self._dirty_indices = set()
+            self._full_rewrite_needed = False
+        self._rebuild_status_counts()
+        self._rebuild_job_index()
+        
+        # Initialize failed batches list from the snapshot and the changes logged since.
+        # The log is only compacted under the lock (see _compact_failed_batches), since
+        # other trackers may be appending to it
+        with file_lock(self.failed_batches_file):
+            self.failed_batches = self._read_failed_batches()
+        
+        # +<id>/-<id> lines not yet appended to the change log
+        self._failed_log_pending = []
+    
+    def _rebuild_status_counts(self):
+        """Recount job statuses from the job status table"""
+        self._status_counter = Counter(self.job_status['status'].dropna())
+    
+    def _rebuild_job_index(self):
+        """
+        Map each job ID (as a string) to the label of its first row, and each batch ID
+        to the labels of all its rows in the job status table. Also collect the labels
+        of rows whose job is still active and of rows whose job failed.
+        """
+        self._row_by_jobid = {}
+        self._rows_by_batch = {}
+        self._active_rows = set()
+        self._failed_rows = set()
+        for label, job_id, batch_id, status in zip(self.job_status.index, self.job_status['job_id'].tolist(),
+                                                   self.job_status['batch_id'].tolist(),
+                                                   self.job_status['status'].tolist()):
+            self._row_by_jobid.setdefault(str(job_id), label)
+            self._rows_by_batch.setdefault(int(batch_id), []).append(label)
+            if status in self.ACTIVE_STATUSES:
+                self._active_rows.add(label)
+            elif status == 'FAILED':
+                self._failed_rows.add(label)
+        # Every batch below this ID has been seen in progress by _get_next_batch_id
+        self._next_batch_cursor = 1
+        self._next_batch_cursor_resubmit = self.resubmit_failed
+    
+    def _track_active_rows(self, labels, statuses):
+        """
+        Keep the active-row and failed-row sets in sync with status updates
+        
+        Args:
+            labels: Row labels whose status changed
+            statuses: New status of each row
+        """
+        for label, status in zip(labels, statuses):
+            if status in self.ACTIVE_STATUSES:
+                self._active_rows.add(label)
+            else:
+                self._active_rows.discard(label)
+            if status == 'FAILED':
+                self._failed_rows.add(label)
+                # A failed batch counts as available again when resubmitting, so rescan
+                self._next_batch_cursor = 1
+            else:
+                self._failed_rows.discard(label)
+    
+    def _get_batch_rows(self, batch_id: int) -> pd.DataFrame:
+        """
+        Get the job status rows of a batch through the batch index
+        
+        Args:
+            batch_id: Batch ID
+            
+        Returns:
+            DataFrame with the batch's rows (empty if the batch has no jobs)
+        """
+        labels = self._rows_by_batch.get(int(batch_id))
+        if not labels:
+            # No rows for this batch: avoid materializing buffered rows
+            return self._job_status.iloc[:0]
+        return self.job_status.loc[labels]
+    
+    def _set_job_fields(self, mask, **fields):
+        """
+        Set column values on the selected rows and mark them for the next save
+        
+        Keeps the status counts in sync when the status column is updated.
+        
+        Args:
+            mask: Boolean mask or index labels selecting the rows to update
+            **fields: Column name -> new value
+        """
+        rows = self.job_status.loc[mask]
+        if 'status' in fields:
+            self._status_counter.subtract(rows['status'].dropna())
+            self._status_counter[fields['status']] += len(rows)
+            self._track_active_rows(rows.index, [fields['status']] * len(rows))
+        for column, value in fields.items():
+            self._ensure_categories(column, [value])
+            self.job_status.loc[mask, column] = value
+        self._dirty_indices.update(rows.index)
+    
+    def _apply_job_updates(self, updates: Dict[Any, Dict[str, Any]]):
+        """
+        Apply buffered per-row field updates with one assignment per column
+        
+        Args:
+            updates: Row label -> {column name -> new value}
+        """
+        if not updates:
+            return
+        
+        # Group the updates by column so each column is assigned once
+        by_column = {}
+        for label, fields in updates.items():
+            for column, value in fields.items():
+                labels, values = by_column.setdefault(column, ([], []))
+                labels.append(label)
+                values.append(value)
+        
+        for column, (labels, values) in by_column.items():
+            if column == 'status':
+                self._status_counter.subtract(self.job_status.loc[labels, 'status'].dropna())
+                self._status_counter.update(values)
+                self._track_active_rows(labels, values)
+            self._ensure_categories(column, values)
+            self.job_status.loc[labels, column] = values
+        self._dirty_indices.update(updates)
+    
+    def _append_job_row(self, new_row: Dict[str, Any]):
+        """
+        Append a job row to the job status table and mark it for the next save
+        
+        The row is buffered and added together with any other pending rows the next
+        time the table is read, so consecutive appends cost one concat instead of one each.
+        
+        Args:
+            new_row: Column name -> value for the new row
+        """
+        # The table keeps a RangeIndex, so the row's label is known before it is materialized
+        label = len(self._job_status) + len(self._row_buffer)
+        self._row_buffer.append(new_row)
+        self._status_counter[new_row['status']] += 1
+        self._row_by_jobid.setdefault(str(new_row['job_id']), label)
+        self._rows_by_batch.setdefault(int(new_row['batch_id']), []).append(label)
+        self._track_active_rows([label], [new_row['status']])
+        self._dirty_indices.add(label)
+    
+    def _drop_job_rows(self, labels):
+        """
+        Remove the selected rows from the job status table
+        
+        Args:
+            labels: Row labels of the rows to remove
+        """
+        self._status_counter.subtract(self.job_status.loc[labels, 'status'].dropna())
+        self.job_status = self.job_status.drop(index=labels).reset_index(drop=True)
+        self._rebuild_job_index()
+        # Row positions changed and rows must disappear from the file, so rewrite it fully
+        self._full_rewrite_needed = True
+    
+    def get_status_counts(self) -> Dict[str, int]:
+        """
+        Get the number of tracked jobs per status
+        
+        Returns:
+            Dictionary of status -> number of jobs
+        """
+        return {status: count for status, count in self._status_counter.items() if count > 0}
+    
+    def _format_csv_times(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pre-format the timestamp columns for CSV output
+        
+        Timestamps are stored with second precision, so numpy's vectorised formatter gives
+        the same text as pandas' per-cell conversion in to_csv at a fraction of the cost.
+        
+        Args:
+            df: Job status rows to be written
+            
+        Returns:
+            Copy of the rows with timestamps as 'YYYY-MM-DD HH:MM:SS' strings ('' for missing)
+        """
+        if df.empty:
+            return df
+        formatted = {}
+        for column in ('submission_time', 'completion_time'):
+            if column in df.columns and pd.api.types.is_datetime64_dtype(df[column]):
+                values = df[column].values
+                text = np.char.replace(np.datetime_as_string(values, unit='s'), 'T', ' ')
+                formatted[column] = np.where(np.isnat(values), '', text)
+        return df.assign(**formatted) if formatted else df
+    
+    def _append_rows_locked(self, rows: pd.DataFrame):
+        """
+        Append rows to the job status file; the caller holds the job status file lock
+        
+        Args:
+            rows: Rows to append, already formatted for CSV output
+        """
+        with open(self.job_status_file, 'a') as f:
+            rows.to_csv(f, header=False, index=False)
+    
+    def _get_job_status_file_state(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the modification time and size of the job status file
+        
+        Returns:
+            Tuple of (mtime in nanoseconds, size in bytes), or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(self.job_status_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _write_job_status(self):
+        """Write pending job status changes, appending only the changed rows when possible"""
+        # Appends and rewrites share one lock, so an append never lands in a file that
+        # another writer is about to replace
+        with file_lock(self.job_status_file, timeout=5.0) as locked:
+            if not locked:
+                # Keep the rows dirty so the next save retries them
+                print("Failed to acquire lock for job status file. Deferring save.")
+                return
+            self._write_job_status_locked()
+    
+    def _write_job_status_locked(self):
+        """Write pending job status changes while holding the job status file lock"""
+        columns = list(self.job_status.columns)
+        # Only our own write may be folded into the known file state; if someone else
+        # changed the file since we last saw it, leave the state stale so run() reloads
+        unchanged_since_read = self._get_job_status_file_state() == self._job_status_file_state
+        # Every status change appends a row, so compact once superseded rows dominate the file
+        pending_rows = self._csv_row_count + len(self._dirty_indices)
+        compact = pending_rows > self.COMPACTION_RATIO * max(len(self.job_status), 1)
+        if (not self._full_rewrite_needed and not compact and columns == self._csv_columns
+                and os.path.exists(self.job_status_file)):
+            if self._dirty_indices:
+                changed = self.job_status.loc[sorted(self._dirty_indices)]
+                self._append_rows_locked(self._format_csv_times(changed))
+                self._csv_row_count += len(changed)
         else:
-            self.failed_batches = set()
-            with open(self.failed_batches_file, 'w') as f:
-                pass
+            # Column layout changed, rows were removed or the file needs compacting:
+            # rewrite the whole file
+            atomic_write_csv(self._format_csv_times(self.job_status), self.job_status_file)
+            self._csv_columns = columns
+            self._csv_row_count = len(self.job_status)
+            self._full_rewrite_needed = False
+        self._dirty_indices.clear()
+        if unchanged_since_read:
+            self._job_status_file_state = self._get_job_status_file_state()
+            self._job_status_tail = self._get_job_status_tail()
     
     def _save_job_status_basic(self):
         """Save current job status to file"""
-        self.job_status.to_csv(self.job_status_file, index=False)
+        self._write_job_status()
         
-    def _save_job_status(self, retries=3):
-        """Save current job status to file with file locking to prevent conflicts"""
-        import fcntl
+    def _save_job_status(self):
+        """
+        Save current job status to file
         
-        # Create a lock file
-        lock_file = f"{self.job_status_file}.lock"
+        Writers hold the shared job_status.csv.lock file while they append or rewrite, and
+        full rewrites are renamed over the status file so readers always see a complete
+        file. If the lock is not acquired within 5 seconds the changes stay pending and are
+        written by the next save.
+        """
+        if self._defer_saves:
+            return
+        self._write_job_status()
+    
+    def flush(self):
+        """Write any job status and failed batch changes that have not been saved yet"""
+        if self._dirty_indices or self._full_rewrite_needed:
+            self._write_job_status()
+        self._flush_failed_log()
+    
+    @contextmanager
+    def deferred_saves(self) -> Iterator['JobTracker']:
+        """
+        Coalesce the saves of a group of updates into one flush() when the block exits
         
+        Blocks may be nested; only the outermost one flushes.
+        
+        Yields:
+            This tracker
+        """
+        already_deferred = self._defer_saves
+        self._defer_saves = True
         try:
-            with open(lock_file, 'w') as lock:
-                # Non-blocking exclusive lock
-                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                
-                # Save the DataFrame to CSV
-                self.job_status.to_csv(self.job_status_file, index=False)
-                
-                # Release the lock
-                fcntl.flock(lock, fcntl.LOCK_UN)
-        except IOError:
-            # Another process is updating the file, wait a bit and try again
-            if retries > 0:
-                time.sleep(0.5)
-                self._save_job_status(retries-1)  # Recursive retry with decremented counter
-            else:
-                print("Failed to acquire lock for job status file. Skipping save.")
+            yield self
         finally:
-            # Remove the lock file if it exists
-            if os.path.exists(lock_file):
-                try:
-                    os.remove(lock_file)
-                except:
-                    pass
+            self._defer_saves = already_deferred
+            if not already_deferred:
+                self.flush()
+    
+    def _read_failed_batches(self) -> Set[int]:
+        """
+        Read the failed batches snapshot and replay the change log on top of it
+        
+        The caller holds the failed batches file lock.
+        
+        Returns:
+            Set of failed batch IDs
+        """
+        failed_batches = set()
+        if os.path.exists(self.failed_batches_file):
+            # One batch ID per line; split() also drops blank lines
+            with open(self.failed_batches_file, 'r') as f:
+                failed_batches = set(map(int, f.read().split()))
+        
+        if os.path.exists(self.failed_batches_log_file):
+            with open(self.failed_batches_log_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if len(line) < 2:
+                        continue
+                    try:
+                        batch_id = int(line[1:])
+                    except ValueError:
+                        continue
+                    if line[0] == '+':
+                        failed_batches.add(batch_id)
+                    elif line[0] == '-':
+                        failed_batches.discard(batch_id)
+        return failed_batches
+    
+    def _save_failed_batches(self, failed_batches: Set[int]):
+        """
+        Save a full snapshot of the failed batches to file
+        
+        Args:
+            failed_batches: Failed batch IDs to write
+        """
+        tmp_file = f"{self.failed_batches_file}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
+        with open(tmp_file, 'w') as f:
+            f.write(''.join(f"{batch_id}\n" for batch_id in sorted(failed_batches)))
+        os.replace(tmp_file, self.failed_batches_file)
+    
+    def _flush_failed_log(self):
+        """Append the pending failed batch changes to the change log under its lock"""
+        if not self._failed_log_pending:
+            return
+        with file_lock(self.failed_batches_file):
+            # Append mode always writes at the current end, even after another tracker compacted the log
+            with open(self.failed_batches_log_file, 'a') as f:
+                f.write(''.join(self._failed_log_pending))
+        self._failed_log_pending.clear()
+    
+    def _compact_failed_batches(self):
+        """
+        Fold the change log into the failed batches snapshot and truncate the log
+        
+        The snapshot is rebuilt from the files rather than from this tracker's set, so
+        changes appended by other trackers are kept.
+        """
+        with file_lock(self.failed_batches_file):
+            if self._failed_log_pending:
+                with open(self.failed_batches_log_file, 'a') as f:
+                    f.write(''.join(self._failed_log_pending))
+                self._failed_log_pending.clear()
+            self._save_failed_batches(self._read_failed_batches())
+            # Every logged change is now in the snapshot
+            open(self.failed_batches_log_file, 'w').close()
+    
+    def _add_failed_batch(self, batch_id: int):
+        """Mark a batch as failed and append the change to the failed batches log"""
+        batch_id = int(batch_id)
+        self.failed_batches.add(batch_id)
+        self._failed_log_pending.append(f"+{batch_id}\n")
+        if not self._defer_saves:
+            self._flush_failed_log()
     
-    def _save_failed_batches(self):
-        """Save failed batches to file"""
-        with open(self.failed_batches_file, 'w') as f:
-            for batch_id in self.failed_batches:
-                f.write(f"{batch_id}\n")
+    def _remove_failed_batch(self, batch_id: int):
+        """Unmark a failed batch and append the change to the failed batches log"""
+        batch_id = int(batch_id)
+        self.failed_batches.discard(batch_id)
+        self._failed_log_pending.append(f"-{batch_id}\n")
+        if not self._defer_saves:
+            self._flush_failed_log()
     
     # Add a method to set resubmission behavior
     def set_resubmit_failed(self, resubmit: bool):
@@ -149,98 +757,123 @@ class JobTracker:
         running_jobs = set()
         status_changes = False
         
+        # Nothing is queued or running: skip the scheduler query and the scan entirely
+        if not self._active_rows:
+            return running_jobs
+        
         # Get all jobs currently in the scheduler queue (from system)
         queue_jobs = self.job_scheduler.get_queue_jobs()
         
-        # Filter for jobs with status 'RUNNING' or 'PENDING'
-        active_jobs = self.job_status[self.job_status['status'].isin(['RUNNING', 'PENDING'])]
+        # Only visit jobs with status 'RUNNING' or 'PENDING', tracked in the active-row set
+        active_jobs = self.job_status.loc[sorted(self._active_rows)]
+        
+        # Limit the scan to the batches this tracker is responsible for
+        if self._min_batch is not None:
+            active_jobs = active_jobs[active_jobs['batch_id'] >= self._min_batch]
+        if self._max_batch is not None:
+            active_jobs = active_jobs[active_jobs['batch_id'] <= self._max_batch]
+        
+        # Query the state of every tracked job still in the queue with a single squeue call
+        # Job IDs are converted to strings once, to match the queue snapshot
+        active_job_ids = active_jobs['job_id'].astype(str).tolist()
+        queued_job_ids = [job_id for job_id in active_job_ids if job_id in queue_jobs]
+        queue_states = self.job_scheduler.get_bulk_queue_states(queued_job_ids)
+        
+        # Jobs that left the queue since the snapshot are looked up with a single sacct call
+        sacct_states = self.job_scheduler.get_bulk_job_states(
+            [job_id for job_id in queued_job_ids if job_id not in queue_states])
+        
+        # Jobs found finished in this pass share one completion time
+        completion_time = self._format_timestamp()
+        
+        # Field updates per row label, applied together after the loop
+        updates = {}
         
-        for _, job in active_jobs.iterrows():
-            job_id = str(job['job_id'])  # Ensure job_id is a string
+        # Progress lines are collected and written with a single print after the loop
+        messages = []
+        
+        # Iterate plain dict records rather than boxing every row into a Series
+        for idx, job_id, job in zip(active_jobs.index, active_job_ids, active_jobs.to_dict('records')):
             batch_id = job['batch_id']   # Get batch_id directly from the current job row
             current_status = job['status']  # Get current status to detect changes
-            
-            # Skip "dry-run" job IDs
-            if job_id == "dry-run":
-                mask = self.job_status['job_id'] == "dry-run"
-            else:
-                mask = self.job_status['job_id'] == int(job_id)
+            row_updates = {}
                 
             # Get the batch_output_dir for this job
             batch_output_dir = os.path.join(self.results_dir, f'batch_{batch_id}')
+            exit_status_file = os.path.join(batch_output_dir, 'exit_status.log')
             
             # Check if job is still in the queue
-            if job_id != "dry-run" and job_id not in queue_jobs:
+            left_queue = job_id != "dry-run" and job_id not in queue_jobs
+            if left_queue:
                 # Job is no longer in queue, check exit status file to determine if it succeeded
-                exit_status_file = os.path.join(batch_output_dir, 'exit_status.log')
+                exit_status = self._read_exit_status(exit_status_file)
                 
-                if os.path.exists(exit_status_file):
-                    with open(exit_status_file, 'r') as f:
-                        exit_status = f.read().strip()
-                        if exit_status == '0':
-                            new_status = 'COMPLETED'
-                            print(f"✅ Job {job_id} for batch {batch_id} completed successfully")
+                if exit_status is not None:
+                    if exit_status == '0':
+                        new_status = 'COMPLETED'
+                        messages.append(f"✅ Job {job_id} for batch {batch_id} completed successfully")
+                    else:
+                        # Check if partial completion - look for completed steps
+                        new_status = self._check_partial_completion(batch_id, batch_output_dir, messages)
+                        if new_status == 'PARTIALLY_COMPLETE':
+                            messages.append(f"⚠️ Job {job_id} for batch {batch_id} partially completed but failed at some step")
+                            # Don't add to failed_batches since it's partially complete
                         else:
-                            # Check if partial completion - look for completed steps
-                            new_status = self._check_partial_completion(batch_id, batch_output_dir)
-                            if new_status == 'PARTIALLY_COMPLETE':
-                                print(f"⚠️ Job {job_id} for batch {batch_id} partially completed but failed at some step")
-                                # Don't add to failed_batches since it's partially complete
-                            else:
-                                new_status = 'FAILED'
-                                self.failed_batches.add(int(batch_id))
-                                print(f"❌ Job {job_id} for batch {batch_id} failed with exit status {exit_status}")
+                            new_status = 'FAILED'
+                            self._add_failed_batch(batch_id)
+                            messages.append(f"❌ Job {job_id} for batch {batch_id} failed with exit status {exit_status}")
                 else:
                     # No exit status file but job is not in queue - check for partial completion
-                    new_status = self._check_partial_completion(batch_id, batch_output_dir)
+                    new_status = self._check_partial_completion(batch_id, batch_output_dir, messages)
                     if new_status == 'PARTIALLY_COMPLETE':
-                        print(f"⚠️ Job {job_id} for batch {batch_id} partially completed but failed at some step")
+                        messages.append(f"⚠️ Job {job_id} for batch {batch_id} partially completed but failed at some step")
                         # Don't add to failed_batches since it's partially complete
                     else:
                         new_status = 'FAILED'
-                        self.failed_batches.add(int(batch_id))
-                        print(f"❌ Job {job_id} for batch {batch_id} is not in queue and no exit status file found")
+                        self._add_failed_batch(batch_id)
+                        messages.append(f"❌ Job {job_id} for batch {batch_id} is not in queue and no exit status file found")
             else:
                 # Job might still be in queue, use scheduler's status check
-                new_status = self.job_scheduler.get_job_status(job_id, batch_output_dir)
+                new_status = self.job_scheduler.get_job_status(job_id, batch_output_dir,
+                                                               queue_states=queue_states,
+                                                               sacct_states=sacct_states)
             
             # Update status if changed
-            if any(mask):  # Verify there are rows that match this job_id
-                if current_status != new_status:  # Status has changed
-                    self.job_status.loc[mask, 'status'] = new_status
-                    
-                    # Explicitly highlight status transitions with better messages
-                    if current_status == 'PENDING' and new_status == 'RUNNING':
-                        print(f"📊 Job {job_id} for batch {batch_id} is now running")
-                    elif new_status == 'COMPLETED':
-                        print(f"✅ Job {job_id} for batch {batch_id} completed successfully")
-                    elif new_status == 'PARTIALLY_COMPLETE':
-                        print(f"⚠️ Job {job_id} for batch {batch_id} partially completed")
-                    elif new_status == 'FAILED':
-                        print(f"❌ Job {job_id} for batch {batch_id} failed")
-                    else:
-                        print(f"Job {job_id} status changed: {current_status} → {new_status}")
-                    
-                    # Track that we had status changes to ensure we save the file
-                    status_changes = True
+            if current_status != new_status:  # Status has changed
+                row_updates['status'] = new_status
+                
+                # Explicitly highlight status transitions with better messages
+                if current_status == 'PENDING' and new_status == 'RUNNING':
+                    messages.append(f"📊 Job {job_id} for batch {batch_id} is now running")
+                elif new_status == 'COMPLETED':
+                    messages.append(f"✅ Job {job_id} for batch {batch_id} completed successfully")
+                elif new_status == 'PARTIALLY_COMPLETE':
+                    messages.append(f"⚠️ Job {job_id} for batch {batch_id} partially completed")
+                elif new_status == 'FAILED':
+                    messages.append(f"❌ Job {job_id} for batch {batch_id} failed")
                 else:
-                    # Status hasn't changed, just log current status (less verbose)
-                    if current_status == 'RUNNING':
-                        print(f"Job {job_id} for batch {batch_id}: {new_status}")
-                    else:
-                        print(f"Job {job_id} status: {new_status}")
-                    
-                # Update workflow stage information for all jobs
-                if new_status in ['RUNNING', 'PENDING', 'COMPLETED', 'FAILED', 'PARTIALLY_COMPLETE']:
-                    # Get the current workflow stage using the job scheduler's method
-                    workflow_stage = self.job_scheduler._get_current_workflow_stage(batch_id, new_status)
-                    
-                    # Only update if it's different from current value
-                    current_workflow_stage = self.job_status.loc[mask, 'workflow_stage'].iloc[0] if not pd.isna(self.job_status.loc[mask, 'workflow_stage'].iloc[0]) else ""
-                    if workflow_stage != current_workflow_stage:
-                        self.job_status.loc[mask, 'workflow_stage'] = workflow_stage
-                        print(f"Updated workflow stage for batch {batch_id}: {current_workflow_stage} → {workflow_stage}")
-                        status_changes = True
+                    messages.append(f"Job {job_id} status changed: {current_status} → {new_status}")
+                
+                # Track that we had status changes to ensure we save the file
+                status_changes = True
+            else:
+                # Status hasn't changed, just log current status (less verbose)
+                if current_status == 'RUNNING':
+                    messages.append(f"Job {job_id} for batch {batch_id}: {new_status}")
+                else:
+                    messages.append(f"Job {job_id} status: {new_status}")
+                
+            # Update workflow stage information for all jobs
+            if new_status in ['RUNNING', 'PENDING', 'COMPLETED', 'FAILED', 'PARTIALLY_COMPLETE']:
+                # Get the current workflow stage using the job scheduler's method
+                workflow_stage = self.job_scheduler._get_current_workflow_stage(batch_id, new_status)
+                
+                # Only update if it's different from current value
+                current_workflow_stage = job['workflow_stage'] if not pd.isna(job['workflow_stage']) else ""
+                if workflow_stage != current_workflow_stage:
+                    row_updates['workflow_stage'] = workflow_stage
+                    messages.append(f"Updated workflow stage for batch {batch_id}: {current_workflow_stage} → {workflow_stage}")
+                    status_changes = True
             
             # Add to running jobs set if still active
             if new_status in ['RUNNING', 'PENDING']:
@@ -248,48 +881,72 @@ class JobTracker:
             else:
                 # Job is no longer running, update completion time    
                 if new_status in ['COMPLETED', 'CANCELLED', 'FAILED', 'TIMEOUT', 'UNKNOWN', 'PARTIALLY_COMPLETE']:
-                    # Use formatted timestamp without fractional seconds
-                    completion_time = self._format_timestamp()
-                    self.job_status.loc[mask, 'completion_time'] = completion_time
+                    row_updates['completion_time'] = completion_time
                     status_changes = True
                     
-                    # Double-check exit status file to verify job completion status
-                    exit_status_file = os.path.join(self.results_dir, f'batch_{batch_id}', 'exit_status.log')
+                    # Double-check exit status file to verify job completion status; jobs that
+                    # left the queue had it read above
+                    if not left_queue:
+                        exit_status = self._read_exit_status(exit_status_file)
                     
-                    if os.path.exists(exit_status_file):
-                        with open(exit_status_file, 'r') as f:
-                            exit_status = f.read().strip()
-                            if exit_status != '0':
-                                # Only add to failed batches if not partially complete
-                                if new_status != 'PARTIALLY_COMPLETE':
-                                    self.failed_batches.add(int(batch_id))
-                                    if new_status != 'FAILED':
-                                        print(f"⚠️ Updating status: Batch {batch_id} failed with exit code {exit_status}")
-                                        self.job_status.loc[mask, 'status'] = 'FAILED'
+                    if exit_status is not None:
+                        if exit_status != '0':
+                            # Only add to failed batches if not partially complete
+                            if new_status != 'PARTIALLY_COMPLETE':
+                                self._add_failed_batch(batch_id)
+                                if new_status != 'FAILED':
+                                    messages.append(f"⚠️ Updating status: Batch {batch_id} failed with exit code {exit_status}")
+                                    row_updates['status'] = 'FAILED'
                     elif new_status not in ['CANCELLED', 'PARTIALLY_COMPLETE']:
                         # No exit status file and not cancelled means the job failed
                         # Only add to failed batches if not partially complete
                         if new_status != 'PARTIALLY_COMPLETE':
-                            self.failed_batches.add(int(batch_id))
+                            self._add_failed_batch(batch_id)
                             if new_status != 'FAILED':
-                                print(f"⚠️ Updating status: Batch {batch_id} failed - no exit status file")
-                                self.job_status.loc[mask, 'status'] = 'FAILED'
+                                messages.append(f"⚠️ Updating status: Batch {batch_id} failed - no exit status file")
+                                row_updates['status'] = 'FAILED'
+                    
+                    # Remember the outcome for the submission backpressure check
+                    final_status = row_updates.get('status', new_status)
+                    if final_status == 'COMPLETED':
+                        self._recent_outcomes.append(True)
+                    elif final_status in ('FAILED', 'TIMEOUT'):
+                        self._recent_outcomes.append(False)
                 else:
-                    print(f"⚠️ Unknown status for job {job_id}: {new_status}")
-                    # Use formatted timestamp without fractional seconds
-                    completion_time = self._format_timestamp()
-                    self.job_status.loc[mask, 'completion_time'] = completion_time
+                    messages.append(f"⚠️ Unknown status for job {job_id}: {new_status}")
+                    row_updates['completion_time'] = completion_time
                     status_changes = True
+            
+            if row_updates:
+                updates[idx] = row_updates
+        
+        if messages:
+            print('\n'.join(messages))
+        
+        # Apply all row updates at once
+        self._apply_job_updates(updates)
                     
         # Final save of job status after processing all jobs
         if status_changes:
             print("Job status changes detected - updating CSV file")
             self._save_job_status()
-            self._save_failed_batches()
         
         return running_jobs
     
-    def _check_partial_completion(self, batch_id: int, batch_output_dir: str) -> str:
+    def _read_exit_status(self, exit_status_file: str) -> Optional[str]:
+        """
+        Read an exit_status.log file through the scheduler's cache
+        
+        Args:
+            exit_status_file: Path to the exit_status.log file
+            
+        Returns:
+            The stripped file content, or None if the file does not exist
+        """
+        return self.job_scheduler._read_exit_status(exit_status_file)
+    
+    def _check_partial_completion(self, batch_id: int, batch_output_dir: str,
+                                  messages: Optional[List[str]] = None) -> str:
         """
         Check if a job was partially completed by looking for exit status log files
         in each workflow step directory.
@@ -297,20 +954,16 @@ class JobTracker:
         Args:
             batch_id: The batch ID to check
             batch_output_dir: Path to the batch output directory
+            messages: List to append the report lines to instead of printing them
             
         Returns:
             'PARTIALLY_COMPLETE' if partial completion detected, 'FAILED' otherwise
         """
-        # Get workflow steps from the config
-        workflow_steps = []
+        # Report lines go to the caller's list when one is given, keeping its output order
+        report = print if messages is None else messages.append
         
-        # Try to extract workflow stages from config structure
-        if 'workflow' in self.config and self.config['workflow']:
-            # Extract from explicit workflow definition
-            workflow_steps = [step.get('name', f'step_{i+1}') for i, step in enumerate(self.config['workflow'])]
-        elif 'scripts' in self.config and self.config['scripts']:
-            # Extract from scripts section - this is the most common case
-            workflow_steps = list(self.config['scripts'].keys())
+        # Get workflow steps from the config
+        workflow_steps = self._workflow_steps
         
         # If no workflow steps found, we can't check for partial completion
         if not workflow_steps:
@@ -320,99 +973,143 @@ class JobTracker:
         completed_steps = []
         failed_steps = []
         
+        # List the step directories that exist with a single directory scan
+        try:
+            with os.scandir(batch_output_dir) as it:
+                step_dirs = {entry.name: entry.path for entry in it if entry.is_dir()}
+        except OSError:
+            step_dirs = {}
+        
         # For each workflow step, check its exit status file
         for step in workflow_steps:
-            step_dir = os.path.join(batch_output_dir, step)
-            exit_status_file = os.path.join(step_dir, 'exit_status.log')
+            step_dir = step_dirs.get(step)
             
             # If the directory doesn't exist, this step wasn't reached
-            if not os.path.exists(step_dir):
+            if step_dir is None:
                 continue
                 
-            # Check if exit status file exists and read its content
-            if os.path.exists(exit_status_file):
-                try:
-                    with open(exit_status_file, 'r') as f:
-                        exit_status = f.read().strip()
-                        if exit_status == '0':
-                            # Step completed successfully
-                            completed_steps.append(step)
-                        else:
-                            # Step failed
-                            failed_steps.append(step)
-                except:
-                    # If we can't read the file, consider the step failed
-                    failed_steps.append(step)
+            # Read the exit status file; a missing file means the step
+            # likely started but didn't complete
+            try:
+                exit_status = self._read_exit_status(os.path.join(step_dir, 'exit_status.log'))
+            except OSError:
+                # If we can't read the file, consider the step failed
+                exit_status = None
+            if exit_status == '0':
+                # Step completed successfully
+                completed_steps.append(step)
             else:
-                # Directory exists but no exit status file - step likely started but didn't complete
+                # Step failed or didn't complete
                 failed_steps.append(step)
         
         # If any steps completed successfully but not all, consider it partially complete
         if completed_steps and len(completed_steps) < len(workflow_steps):
             # Calculate completion percentage for better reporting
             completion_percentage = (len(completed_steps) / len(workflow_steps)) * 100
-            print(f"Batch {batch_id} partially completed {len(completed_steps)}/{len(workflow_steps)} steps ({completion_percentage:.1f}%): {', '.join(completed_steps)}")
+            report(f"Batch {batch_id} partially completed {len(completed_steps)}/{len(workflow_steps)} steps ({completion_percentage:.1f}%): {', '.join(completed_steps)}")
             return 'PARTIALLY_COMPLETE'
         # If all steps completed, this shouldn't happen as the main exit status would be successful
         elif len(completed_steps) == len(workflow_steps):
-            print(f"Batch {batch_id} appears to have all steps completed - should be marked as COMPLETED")
+            report(f"Batch {batch_id} appears to have all steps completed - should be marked as COMPLETED")
             return 'COMPLETED'
         # If no steps completed successfully
         else:
             if failed_steps:
-                print(f"Batch {batch_id} failed in steps: {', '.join(failed_steps)}")
+                report(f"Batch {batch_id} failed in steps: {', '.join(failed_steps)}")
             return 'FAILED'
     
-    def _get_next_batch_id(self) -> int:
-        """Get the next batch ID to process"""
-        # Get all batch IDs that are currently being processed (any status except FAILED)
+    def _batch_in_progress(self, batch_id: int) -> bool:
+        """
+        Check whether a batch already has jobs in the job status table
+        
+        Args:
+            batch_id: Batch ID
+            
+        Returns:
+            True if the batch has a job, not counting FAILED jobs when resubmitting
+        """
+        labels = self._rows_by_batch.get(batch_id)
+        if not labels:
+            return False
         # MODIFIED: Don't consider FAILED jobs as in progress when resubmitting
         if self.resubmit_failed:
-            in_progress_batch_ids = set(self.job_status[~self.job_status['status'].isin(['FAILED'])]['batch_id'])
-        else:
-            in_progress_batch_ids = set(self.job_status['batch_id'])
+            return any(label not in self._failed_rows for label in labels)
+        return True
+    
+    def _get_next_batch_id(self, total_batches: Optional[int] = None,
+                           exclude: Optional[Set[int]] = None) -> int:
+        """
+        Get the next batch ID to process
+        
+        Args:
+            total_batches: Number of batches, if already known for this polling cycle
+            exclude: Batches to skip as if they were in progress (already chosen for submission)
+            
+        Returns:
+            Batch ID to submit next, or -1 if there is none
+        """
+        # Batch range bounds, open-ended where no limit was given
+        low = self._min_batch if self._min_batch is not None else float('-inf')
+        high = self._max_batch if self._max_batch is not None else float('inf')
+        
+        # Batches being processed (any status except FAILED) are looked up per candidate
+        # in the batch index instead of being collected from the whole job status table
+        in_progress = self._batch_in_progress
+        if exclude:
+            in_progress = lambda batch_id: batch_id in exclude or self._batch_in_progress(batch_id)
+        
+        # Failed batches only count as in progress when not resubmitting, so the scan
+        # cursor is only valid for the setting it was computed with
+        if self._next_batch_cursor_resubmit != self.resubmit_failed:
+            self._next_batch_cursor = 1
+            self._next_batch_cursor_resubmit = self.resubmit_failed
         
         # First, try to process any failed batches if resubmission is enabled
         if self.resubmit_failed and self.failed_batches:
-            # Filter failed batches by the specified range if applicable
-            if self.batch_range:
-                min_batch, max_batch = self.batch_range
-                filtered_failed_batches = [b for b in self.failed_batches if 
-                                          (min_batch is None or b >= min_batch) and 
-                                          (max_batch is None or b <= max_batch)]
-                
-                # Only consider failed batches that aren't currently in progress
-                available_failed_batches = [b for b in filtered_failed_batches if b not in in_progress_batch_ids]
-                
-                if available_failed_batches:
-                    # ADDED: Improved logging
-                    print(f"Found {len(available_failed_batches)} failed batches eligible for resubmission")
-                    return min(available_failed_batches)
-            else:
-                # Only consider failed batches that aren't currently in progress
-                available_failed_batches = [b for b in self.failed_batches if b not in in_progress_batch_ids]
-                if available_failed_batches:
-                    # ADDED: Improved logging
-                    print(f"Found {len(available_failed_batches)} failed batches eligible for resubmission")
-                    return min(available_failed_batches)
-        
-        # Then, find the next batch that hasn't been processed or isn't in progress
-        total_batches = self.batch_manager.get_num_batches()
-        for batch_id in range(1, total_batches + 1):
-            # Skip if batch is outside the specified range
-            if self.batch_range:
-                min_batch, max_batch = self.batch_range
-                if (min_batch is not None and batch_id < min_batch) or \
-                   (max_batch is not None and batch_id > max_batch):
+            # Count the eligible failed batches and track the lowest one in a single pass:
+            # within the batch range (if any) and not currently in progress
+            num_available = 0
+            lowest_available = None
+            for b in self.failed_batches:
+                if not low <= b <= high or in_progress(b):
                     continue
-                    
+                num_available += 1
+                if lowest_available is None or b < lowest_available:
+                    lowest_available = b
+            
+            if num_available:
+                # ADDED: Improved logging
+                print(f"Found {num_available} failed batches eligible for resubmission")
+                return lowest_available
+        
+        # Then, find the next batch that hasn't been processed or isn't in progress,
+        # resuming after the batches already found to be in progress
+        if total_batches is None:
+            total_batches = self.batch_manager.get_num_batches()
+        first_batch = max(self._next_batch_cursor, low)
+        last_batch = min(total_batches, high)
+        for batch_id in range(first_batch, last_batch + 1):
             # Check if this batch is already being processed
-            if batch_id not in in_progress_batch_ids:
+            if not in_progress(batch_id):
+                self._next_batch_cursor = batch_id
                 return batch_id
+        self._next_batch_cursor = max(self._next_batch_cursor, last_batch + 1)
         
         # If we've already submitted jobs for all batches in the range
         return -1
     
+    def _get_recent_failure_rate(self) -> Optional[float]:
+        """
+        Get the fraction of recently finished jobs that failed
+        
+        Returns:
+            Failure rate over the last failure_window finished jobs, or None until at least
+            half of the window has been observed
+        """
+        if len(self._recent_outcomes) < max(1, self._recent_outcomes.maxlen // 2):
+            return None
+        return self._recent_outcomes.count(False) / len(self._recent_outcomes)
+    
     def prepare_environment(self) -> bool:
         """
         Prepare the environment for job submission:
@@ -430,13 +1127,13 @@ class JobTracker:
         else:
             db_path = self.config['database']['path']
             if os.path.exists(db_path):
-                cif_files = self.batch_manager._find_cif_files()
-                if cif_files:
-                    print(f"✓ Database ready: Found {len(cif_files)} CIF files at {db_path}")
+                # Only whether there are any CIF files matters here, not the full list
+                if self.batch_manager.has_any_cif_files():
+                    print(f"✓ Database ready: Found CIF files at {db_path}")
                 else:
                     print(f"⚠️ WARNING: Database exists at {db_path} but contains no CIF files")
                     # Try to download if remote URL is available and path is empty
-                    if os.path.isdir(db_path) and not os.listdir(db_path):
+                    if os.path.isdir(db_path) and is_dir_empty(db_path):
                         print(f"Database directory is empty. Will try to download.")
                         if not self._ensure_database():
                             print("⚠️ Database preparation failed")
@@ -483,12 +1180,11 @@ class JobTracker:
         if os.path.exists(db_path):
             # For directories, check if they have CIF files
             if os.path.isdir(db_path):
-                cif_files = self.batch_manager._find_cif_files()
-                if cif_files:
-                    print(f"✓ Database ready: Found {len(cif_files)} CIF files")
+                if self.batch_manager.has_any_cif_files():
+                    print(f"✓ Database ready: Found CIF files at {db_path}")
                     return True
                 # If directory exists but is empty, try to download
-                elif not os.listdir(db_path) and 'remote_url' in self.config['database']:
+                elif is_dir_empty(db_path) and 'remote_url' in self.config['database']:
                     print(f"Database directory exists but is empty. Will download files.")
                 else:
                     print(f"⚠️ Database exists but contains no CIF files and no remote URL is configured.")
@@ -543,14 +1239,33 @@ class JobTracker:
         # Create parent directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
         
-        # Try wget first (which has built-in progress)
-        try:
-            print("Trying download with wget...")
-            subprocess.run(['wget', url, '-O', dest_path, '--show-progress'], check=True)
-            print(f"Download complete: {dest_path}")
-            return
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            print(f"wget error: {e}")
+        # Try aria2c first: it downloads over several connections at once
+        if shutil.which('aria2c'):
+            try:
+                print("Trying download with aria2c...")
+                dest_dir, dest_name = os.path.split(os.path.abspath(dest_path))
+                subprocess.run(['aria2c', '-x', '16', '-s', '16', '--allow-overwrite=true',
+                                '--auto-file-renaming=false', '-d', dest_dir, '-o', dest_name, url],
+                               check=True)
+                print(f"Download complete: {dest_path}")
+                return
+            except (subprocess.SubprocessError, FileNotFoundError) as e:
+                print(f"aria2c error: {e}")
+                print("aria2c download failed, falling back to wget...")
+        else:
+            print("aria2c not available, falling back to wget...")
+        
+        # Then wget (which has built-in progress)
+        if shutil.which('wget'):
+            try:
+                print("Trying download with wget...")
+                subprocess.run(['wget', url, '-O', dest_path, '--show-progress'], check=True)
+                print(f"Download complete: {dest_path}")
+                return
+            except (subprocess.SubprocessError, FileNotFoundError) as e:
+                print(f"wget error: {e}")
+                print("wget download failed, falling back to Python requests...")
+        else:
             print("wget not available, falling back to Python requests...")
         
         # Fall back to requests if wget is not available
@@ -559,46 +1274,94 @@ class JobTracker:
             with requests.get(url, stream=True) as r:
                 r.raise_for_status()
                 total_size = int(r.headers.get('content-length', 0))
-                block_size = 8192
+                block_size = 1024 * 1024
+                # Let the raw stream undo any transfer encoding, as iter_content would
+                r.raw.decode_content = True
                 with open(dest_path, 'wb') as f, tqdm(
                     total=total_size, unit='B', unit_scale=True, 
                     desc=f"Downloading {os.path.basename(dest_path)}"
                 ) as pbar:
-                    for chunk in r.iter_content(chunk_size=block_size):
-                        if chunk:
-                            f.write(chunk)
-                            pbar.update(len(chunk))
+                    # Copy in large blocks, reporting progress from the read calls
+                    shutil.copyfileobj(CallbackIOWrapper(pbar.update, r.raw, 'read'), f, length=block_size)
             print(f"Download complete: {dest_path}")
         except Exception as e:
             print(f"Download failed with error: {e}")
             raise RuntimeError(f"Failed to download file: {e}")
     
+    def _run_tool(self, command: List[str]) -> bool:
+        """
+        Run an external command if its executable is installed
+        
+        Args:
+            command: Command and arguments
+            
+        Returns:
+            True if the command ran successfully, False if it is not installed or failed
+        """
+        if not shutil.which(command[0]):
+            return False
+        try:
+            subprocess.run(command, check=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return False
+        return True
+    
+    def _extract_zip(self, archive_path: str, extract_path: str):
+        """
+        Extract a zip archive with Python's zipfile module, several members at a time
+        
+        Zip members are compressed independently and zlib releases the GIL while
+        inflating, so each thread extracts its share of the members through its own handle.
+        
+        Args:
+            archive_path: Path to the zip archive
+            extract_path: Directory to extract into
+        """
+        import zipfile
+        
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+            members = zip_ref.namelist()
+        num_workers = min(os.cpu_count() or 1, len(members))
+        if num_workers <= 1:
+            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                zip_ref.extractall(extract_path)
+            return
+        
+        def extract_members(names):
+            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                for name in names:
+                    try:
+                        zip_ref.extract(name, extract_path)
+                    except FileExistsError:
+                        # Another thread created the member's parent directory first
+                        zip_ref.extract(name, extract_path)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            # Consume the results so errors from any thread are raised here
+            list(executor.map(extract_members, [members[i::num_workers] for i in range(num_workers)]))
+    
     def _extract_archive(self, archive_path: str, extract_path: str):
         """Extract an archive file with appropriate method based on extension"""
         print(f"Extracting {archive_path} to {extract_path}")
         
         if archive_path.endswith('.zip'):
-            try:
-                # Try using unzip command first
-                subprocess.run(['unzip', archive_path, '-d', extract_path], check=True)
-            except (subprocess.SubprocessError, FileNotFoundError):
+            # Try using unzip command first
+            if not self._run_tool(['unzip', archive_path, '-d', extract_path]):
                 # Fall back to Python's zipfile module
-                import zipfile
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_path)
+                self._extract_zip(archive_path, extract_path)
         elif archive_path.endswith(('.tar.gz', '.tgz')):
-            try:
-                # Try using tar command first
-                subprocess.run(['tar', '-xzf', archive_path, '-C', extract_path], check=True)
-            except (subprocess.SubprocessError, FileNotFoundError):
+            # Try using tar command first, decompressing with parallel pigz when available
+            if shutil.which('pigz'):
+                command = ['tar', '-I', 'pigz', '-xf', archive_path, '-C', extract_path]
+            else:
+                command = ['tar', '-xzf', archive_path, '-C', extract_path]
+            if not self._run_tool(command):
                 # Fall back to Python's tarfile module
                 import tarfile
                 with tarfile.open(archive_path, 'r:gz') as tar_ref:
                     tar_ref.extractall(extract_path)
         elif archive_path.endswith('.tar'):
-            try:
-                subprocess.run(['tar', '-xf', archive_path, '-C', extract_path], check=True)
-            except (subprocess.SubprocessError, FileNotFoundError):
+            if not self._run_tool(['tar', '-xf', archive_path, '-C', extract_path]):
                 import tarfile
                 with tarfile.open(archive_path, 'r') as tar_ref:
                     tar_ref.extractall(extract_path)
@@ -607,6 +1370,19 @@ class JobTracker:
         
         print(f"Extraction complete to: {extract_path}")
     
+    def _pending_limit_reached(self) -> bool:
+        """
+        Check whether max_pending_jobs jobs are already pending or running
+        
+        Returns:
+            True if a new submission must be rejected
+        """
+        if self.max_pending_jobs is None or len(self._active_rows) < self.max_pending_jobs:
+            return False
+        print(f"⚠️ {len(self._active_rows)} jobs are already pending or running "
+              f"(max_pending_jobs={self.max_pending_jobs}). Rejecting new submission.")
+        return True
+    
     def submit_next_job(self, dry_run: bool = False) -> bool:
         """
         Submit the next batch job if possible
@@ -616,9 +1392,11 @@ class JobTracker:
         """
         running_jobs = self._get_running_jobs()
         
-        # Check if we can submit more jobs
+        # Check if we can submit more jobs; the pending cap also counts single-CIF jobs
         if len(running_jobs) >= self.max_concurrent_jobs:
             return False
+        if not dry_run and self._pending_limit_reached():
+            return False
         
         # Get the next batch to process
         next_batch_id = self._get_next_batch_id()
@@ -626,54 +1404,135 @@ class JobTracker:
         if next_batch_id == -1:
             # No more batches to process
             return False
+        
+        return self._submit_one(next_batch_id, dry_run=dry_run)
+    
+    def _submit_one(self, next_batch_id: int, dry_run: bool = False) -> bool:
+        """
+        Submit a job for the given batch without re-polling the scheduler
+        
+        Args:
+            next_batch_id: Batch ID to submit, as returned by _get_next_batch_id
+            dry_run: If True, generate the job script but don't submit it
             
+        Returns:
+            True if a job was submitted, False otherwise
+        """
+        script_path = self._prepare_submission(next_batch_id)
+        if script_path is None:
+            return False
+        
+        # Submit the job - pass batch_id to store the relationship
+        job_id = self.job_scheduler.submit_job(script_path, dry_run=dry_run, batch_id=next_batch_id)
+        return self._record_submission(next_batch_id, job_id)
+    
+    def _submit_batches(self, slots: int, total_batches: int) -> int:
+        """
+        Fill several free slots at once, running the sbatch calls concurrently
+        
+        Batches are chosen and their job scripts created one after another as in the
+        sequential loop, stopping at the first batch that cannot be prepared; only the
+        submissions themselves overlap.
+        
+        Args:
+            slots: Number of jobs that may be submitted
+            total_batches: Number of batches for this polling cycle
+            
+        Returns:
+            Number of jobs submitted
+        """
+        submissions = []
+        reserved = set()
+        for _ in range(slots):
+            next_batch_id = self._get_next_batch_id(total_batches, exclude=reserved)
+            if next_batch_id == -1:
+                break
+            script_path = self._prepare_submission(next_batch_id)
+            if script_path is None:
+                break
+            reserved.add(next_batch_id)
+            submissions.append((script_path, next_batch_id))
+        
+        if not submissions:
+            return 0
+        job_ids = self.job_scheduler.submit_jobs(submissions)
+        jobs_submitted = 0
+        for (_, batch_id), job_id in zip(submissions, job_ids):
+            if self._record_submission(batch_id, job_id):
+                jobs_submitted += 1
+            else:
+                # Reserving later batches moved the scan cursor past this one; move it
+                # back so the batch is tried again on the next cycle, as in the sequential loop
+                self._next_batch_cursor = min(self._next_batch_cursor, batch_id)
+        return jobs_submitted
+    
+    def _prepare_submission(self, next_batch_id: int) -> Optional[str]:
+        """
+        Check that a batch can be submitted and create its job script
+        
+        Args:
+            next_batch_id: Batch ID to submit
+            
+        Returns:
+            Path to the job script, or None if the batch cannot be submitted
+        """
         # Double check that this batch isn't already in progress (just to be safe)
-        batch_jobs = self.job_status[self.job_status['batch_id'] == next_batch_id]
+        batch_jobs = self._get_batch_rows(next_batch_id)
         
         # For resubmission of failed jobs, we need to clear the existing entries
         # MODIFIED: If job is failed and we're resubmitting, remove from job_status first
         if self.resubmit_failed and next_batch_id in self.failed_batches and not batch_jobs.empty:
             if all(status == 'FAILED' for status in batch_jobs['status']):
                 print(f"Removing failed job entries for batch {next_batch_id} to enable resubmission")
-                self.job_status = self.job_status[self.job_status['batch_id'] != next_batch_id]
-                batch_jobs = self.job_status[self.job_status['batch_id'] == next_batch_id]  # Should now be empty
+                self._drop_job_rows(batch_jobs.index)
+                batch_jobs = self._get_batch_rows(next_batch_id)  # Should now be empty
         
         if not batch_jobs.empty:
             active_jobs = batch_jobs[batch_jobs['status'].isin(['PENDING', 'RUNNING'])]
             if not active_jobs.empty:
                 print(f"⚠️ Batch {next_batch_id} already has active jobs. Skipping to prevent duplicates.")
-                return False
+                return None
         
         # Get the files for the batch
         try:
+            # get_batch_files already returns existing paths as strings
             batch_files = self.batch_manager.get_batch_files(next_batch_id)
-            # Ensure all file paths are strings
-            batch_files = [str(file_path) for file_path in batch_files if file_path]
         except ValueError as e:
             print(f"Error getting batch files: {e}")
             # If the batch doesn't exist, try to create batches first
             self.batch_manager.create_batches()
             try:
                 batch_files = self.batch_manager.get_batch_files(next_batch_id)
-                # Ensure all file paths are strings
-                batch_files = [str(file_path) for file_path in batch_files if file_path]
             except ValueError:
                 print(f"⚠️ Could not create or find batch {next_batch_id}. Skipping.")
-                return False
+                return None
         
         # Skip empty batches
         if not batch_files:
             print(f"⚠️ Batch {next_batch_id} has no files. Skipping.")
-            self.failed_batches.add(int(next_batch_id))
-            self._save_failed_batches()
-            return False
+            self._add_failed_batch(next_batch_id)
+            return None
         
         # Create the job script
         script_path = self.job_scheduler.create_job_script(next_batch_id, batch_files)
+        if script_path is None:
+            print(f"⚠️ Failed to submit job for batch {next_batch_id}")
+            return None
         
-        # Submit the job - pass batch_id to store the relationship
         print(f"Submitting job for batch {next_batch_id} with {len(batch_files)} CIF files...")
-        job_id = self.job_scheduler.submit_job(script_path, dry_run=dry_run, batch_id=next_batch_id)
+        return script_path
+    
+    def _record_submission(self, next_batch_id: int, job_id: Optional[str]) -> bool:
+        """
+        Track the job submitted for a batch
+        
+        Args:
+            next_batch_id: Batch ID the job was submitted for
+            job_id: Job ID returned by the scheduler, or None if the submission failed
+            
+        Returns:
+            True if a job was submitted, False otherwise
+        """
         if job_id:
             # Update job status
             new_row = {
@@ -684,16 +1543,13 @@ class JobTracker:
                 'completion_time': None,
                 'workflow_stage': 'pending'  # ADDED: Initialize workflow stage
             }
-            # Create a new DataFrame with the same dtypes as self.job_status
-            new_df = pd.DataFrame([new_row], columns=self.job_status.columns).astype(self.job_status.dtypes)
-            self.job_status = pd.concat([self.job_status, new_df], ignore_index=True)
+            self._append_job_row(new_row)
             self._save_job_status()
             
             # Remove batch from failed batches if it was a retry
             if next_batch_id in self.failed_batches:
                 print(f"✓ Batch {next_batch_id} resubmitted successfully, removing from failed batches")
-                self.failed_batches.remove(next_batch_id)
-                self._save_failed_batches()
+                self._remove_failed_batch(next_batch_id)
             
             print(f"✓ Submitted job for batch {next_batch_id} with job ID {job_id}")
             return True
@@ -725,56 +1581,58 @@ class JobTracker:
         # Make sure subprocess is imported
         import subprocess
         
-        # Identify batches with multiple active jobs
-        batch_groups = self.job_status.groupby('batch_id')
-        problematic_batches = []
-        
-        for batch_id, group in batch_groups:
-            active_jobs = group[group['status'].isin(['PENDING', 'RUNNING'])]
-            if len(active_jobs) > 1:
-                problematic_batches.append((batch_id, len(active_jobs)))
-                
-                # Logic for prioritization:
-                # 1. If PENDING jobs exist, keep the oldest PENDING job
-                # 2. If only RUNNING jobs exist, keep the newest RUNNING job
-                
-                pending_jobs = active_jobs[active_jobs['status'] == 'PENDING']
-                if not pending_jobs.empty:
-                    # PENDING jobs exist - keep oldest PENDING job
-                    sorted_pending = pending_jobs.sort_values('submission_time', ascending=True)
-                    job_to_keep_idx = sorted_pending.index[0]
-                    job_to_keep_id = self.job_status.loc[job_to_keep_idx, 'job_id']
+        # Identify batches with multiple active jobs among the tracked active rows
+        active_jobs = self.job_status.loc[sorted(self._active_rows)]
+        duplicates = active_jobs[active_jobs['batch_id'].duplicated(keep=False)]
+        
+        if not duplicates.empty:
+            # Logic for prioritization:
+            # 1. If PENDING jobs exist, keep the oldest PENDING job
+            # 2. If only RUNNING jobs exist, keep the newest RUNNING job
+            is_pending = duplicates['status'] == 'PENDING'
+            has_pending = is_pending.groupby(duplicates['batch_id']).transform('any')
+            candidates = duplicates[is_pending | ~has_pending]
+            
+            # Sort key: submission time ascending for PENDING batches, descending for RUNNING
+            # ones, with missing times last as sort_values would place them
+            submitted = candidates['submission_time'].astype('int64').astype(float)
+            submitted[candidates['submission_time'].isna()] = float('nan')
+            order_key = submitted.where(has_pending[candidates.index], -submitted)
+            ranked = candidates.assign(_order=order_key).sort_values(['batch_id', '_order'], kind='mergesort')
+            keep = ranked.drop_duplicates('batch_id')
+            
+            cancel = duplicates.drop(keep.index)
+            # Split the jobs to cancel by batch once instead of filtering them per batch
+            cancel_by_batch = {batch_id: group for batch_id, group in cancel.groupby('batch_id', sort=False)}
+            jobs_to_cancel = []
+            for batch_id, job_to_keep_id, status in zip(keep['batch_id'], keep['job_id'], keep['status']):
+                if status == 'PENDING':
                     print(f"Batch {batch_id}: Keeping oldest PENDING job {job_to_keep_id}")
                 else:
-                    # Only RUNNING jobs - keep newest RUNNING job
-                    sorted_running = active_jobs.sort_values('submission_time', ascending=False)
-                    job_to_keep_idx = sorted_running.index[0]
-                    job_to_keep_id = self.job_status.loc[job_to_keep_idx, 'job_id']
                     print(f"Batch {batch_id}: Keeping newest RUNNING job {job_to_keep_id}")
                 
-                # Mark all other jobs as 'CANCELLED' and actually cancel them in SLURM
-                for idx in active_jobs.index:
-                    if idx != job_to_keep_idx:
-                        job_id = str(self.job_status.loc[idx, 'job_id'])
-                        job_status = self.job_status.loc[idx, 'status']
-                        
-                        # Skip "dry-run" job IDs
-                        if job_id != "dry-run":
-                            try:
-                                # Issue scancel command to cancel job
-                                print(f"  Cancelling {job_status} job {job_id} for batch {batch_id}")
-                                subprocess.run(['scancel', job_id], check=False)
-                                issues_fixed += 1
-                            except Exception as e:
-                                print(f"  Failed to cancel job {job_id}: {e}")
-                        
-                        # Update job status in tracking file
-                        self.job_status.loc[idx, 'status'] = 'CANCELLED'
-                        # Use formatted timestamp without fractional seconds
-                        self.job_status.loc[idx, 'completion_time'] = self._format_timestamp()
-        
-        if problematic_batches:
-            print(f"\nFound {len(problematic_batches)} batches with multiple active jobs")
+                # Collect all other jobs of the batch for cancellation in SLURM
+                batch_cancel = cancel_by_batch.get(batch_id, cancel.iloc[:0])
+                for job_id, job_status in zip(batch_cancel['job_id'].astype(str), batch_cancel['status']):
+                    # Skip "dry-run" job IDs
+                    if job_id != "dry-run":
+                        print(f"  Cancelling {job_status} job {job_id} for batch {batch_id}")
+                        jobs_to_cancel.append(job_id)
+            
+            # scancel accepts several job IDs, so cancel them all with a single command
+            if jobs_to_cancel:
+                try:
+                    subprocess.run(['scancel', *jobs_to_cancel], check=False)
+                    issues_fixed += len(jobs_to_cancel)
+                except Exception as e:
+                    print(f"  Failed to cancel jobs {', '.join(jobs_to_cancel)}: {e}")
+            
+            # Mark all other jobs as 'CANCELLED' in the tracking file with one update
+            # Use formatted timestamp without fractional seconds
+            self._set_job_fields(cancel.index, status='CANCELLED', completion_time=self._format_timestamp())
+        
+        if not duplicates.empty:
+            print(f"\nFound {duplicates['batch_id'].nunique()} batches with multiple active jobs")
             
             # Save the cleaned job status
             self._save_job_status()
@@ -784,7 +1642,12 @@ class JobTracker:
             
         return issues_fixed
     
-    def run(self, polling_interval: int = 60, dry_run: bool = False, resubmit_failed: Optional[bool] = None):
+    def wake(self):
+        """Cut short the polling loop's current wait so the next status check runs immediately"""
+        self._wake.set()
+    
+    def run(self, polling_interval: int = 60, dry_run: bool = False, resubmit_failed: Optional[bool] = None,
+            max_polling_interval: Optional[int] = None):
         """
         Run the job tracking and submission process
         
@@ -792,7 +1655,13 @@ class JobTracker:
             polling_interval: Time (in seconds) to wait between status checks
             dry_run: If True, only generate job scripts but don't submit them
             resubmit_failed: If provided, overrides the current resubmit_failed setting
+            max_polling_interval: If larger than polling_interval, the wait doubles up to this
+                many seconds while the set of running jobs stays the same, and drops back to
+                polling_interval as soon as anything changes
         """
+        if max_polling_interval is None or max_polling_interval < polling_interval:
+            max_polling_interval = polling_interval
+        
         # ADDED: More explicit resubmit_failed handling
         if resubmit_failed is not None:
             self.resubmit_failed = resubmit_failed
@@ -804,7 +1673,10 @@ class JobTracker:
         print("=== Starting gRASPA Job Tracker ===")
         print(f"Output path: {self.output_path}")
         print(f"Maximum concurrent jobs: {self.max_concurrent_jobs}")
-        print(f"Polling interval: {polling_interval} seconds")
+        if max_polling_interval > polling_interval:
+            print(f"Polling interval: {polling_interval}-{max_polling_interval} seconds (adaptive)")
+        else:
+            print(f"Polling interval: {polling_interval} seconds")
         print(f"Resubmit failed jobs: {'Yes' if self.resubmit_failed else 'No'}")
         
         # Clean up any inconsistencies in the job status file
@@ -861,71 +1733,159 @@ class JobTracker:
         
         # Main loop
         print("\n=== Starting Job Submission Loop ===")
+        self._defer_saves = True
+        wait_interval = polling_interval
+        previous_running_jobs = None
         try:
             while True:
-                # Force a refresh of job status from any external changes
+                # Refresh job status if the file was changed by anyone but this tracker
                 try:
-                    if os.path.exists(self.job_status_file):
-                        previous_status = self.job_status.copy()
-                        self.job_status = pd.read_csv(self.job_status_file)
-                        
-                        # Check if any status changed from external updates
-                        if not previous_status.equals(self.job_status):
-                            print("Job status file was updated externally. Refreshed job status.")
+                    file_state = self._get_job_status_file_state()
+                    if file_state is not None and file_state != self._job_status_file_state:
+                        previous_rows = len(self.job_status)
+                        self.job_status = self._reload_job_status()
+                        self._rebuild_status_counts()
+                        self._rebuild_job_index()
+                        print(f"Job status file was updated externally. Refreshed job status "
+                              f"({previous_rows} -> {len(self.job_status)} rows).")
                 except Exception as e:
                     print(f"Warning: Could not refresh job status from file: {e}")
 
                 # Then get current running jobs
                 running_jobs = self._get_running_jobs()
+                running_count = len(running_jobs)
                 if running_jobs:
-                    print(f"Currently running jobs: {len(running_jobs)}")
+                    # Collect the per-job lines and print them with a single write
+                    lines = [f"Currently running jobs: {running_count}"]
+                    # Row labels are positions (RangeIndex), so index the column array directly
+                    batch_id_values = self.job_status['batch_id'].to_numpy()
                     for job_id in running_jobs:
-                        # Find the batch ID for this job ID safely
-                        if job_id == "dry-run":
-                            job_rows = self.job_status[self.job_status['job_id'] == "dry-run"]
-                        else:
-                            job_rows = self.job_status[self.job_status['job_id'] == int(job_id)]
-                        if not job_rows.empty:
-                            batch_id = job_rows['batch_id'].iloc[0]
-                            print(f"  - Batch {batch_id}: Job ID {job_id}")
+                        # Find the batch ID for this job ID through the job index
+                        row_label = self._row_by_jobid.get(job_id)
+                        if row_label is not None:
+                            batch_id = batch_id_values[row_label]
+                            lines.append(f"  - Batch {batch_id}: Job ID {job_id}")
                         else:
                             # Try to get batch ID from the job scheduler's mapping
                             batch_id = self.job_scheduler.get_batch_id_for_job(job_id)
                             if batch_id is not None:
-                                print(f"  - Batch {batch_id}: Job ID {job_id}")
+                                lines.append(f"  - Batch {batch_id}: Job ID {job_id}")
                             else:
-                                print(f"  - Unknown batch: Job ID {job_id}")
+                                lines.append(f"  - Unknown batch: Job ID {job_id}")
+                    print("\n".join(lines))
                 
-                # Try to submit new jobs if needed
+                # Try to submit new jobs if needed, using the running jobs polled above
                 jobs_submitted = 0
-                while len(running_jobs) + jobs_submitted < self.max_concurrent_jobs:
-                    submitted = self.submit_next_job(dry_run=dry_run)
-                    if submitted:
-                        jobs_submitted += 1
-                    else:
-                        break
+                slots = self.max_concurrent_jobs - running_count
+                
+                # Stop feeding the cluster while most recent jobs fail (e.g. a broken setup)
+                failure_rate = self._get_recent_failure_rate() if slots > 0 else None
+                paused = (self.max_failure_rate is not None and failure_rate is not None
+                          and failure_rate > self.max_failure_rate)
+                if paused:
+                    print(f"⏸ Backpressure: {failure_rate:.0%} of the last {len(self._recent_outcomes)} "
+                          f"finished jobs failed. Pausing new submissions.")
+                    slots = 0
+                # The batch count only changes when batches are created, so list them once per cycle
+                total_batches = self.batch_manager.get_num_batches() if slots > 0 else 0
+                if slots > 1 and not dry_run:
+                    jobs_submitted = self._submit_batches(slots, total_batches)
+                else:
+                    for _ in range(slots):
+                        next_batch_id = self._get_next_batch_id(total_batches)
+                        if next_batch_id == -1:
+                            break
+                        if self._submit_one(next_batch_id, dry_run=dry_run):
+                            jobs_submitted += 1
+                        else:
+                            break
+                
+                # One status write per cycle, before the file is re-read on the next one
+                self.flush()
                 
                 # If no running jobs and no jobs were submitted, we're done
-                if len(running_jobs) == 0 and jobs_submitted == 0:
-                    if self.failed_batches:
+                if running_count == 0 and jobs_submitted == 0:
+                    if paused:
+                        print(f"\n⚠️ Stopping: submissions are paused because too many recent jobs failed.")
+                        print(f"Failed batches: {sorted(self.failed_batches)}")
+                    elif self.failed_batches:
                         print(f"\n⚠️ All jobs completed but there are {len(self.failed_batches)} failed batches.")
                         print(f"Failed batches: {sorted(self.failed_batches)}")
                     else:
                         print("\n✅ All jobs completed successfully!")
                     break
                 
-                # Wait for the polling interval
-                print(f"Waiting {polling_interval} seconds before next check...")
-                time.sleep(polling_interval)
+                # Back off while nothing changes; any completion or submission resets the wait
+                current_running_jobs = set(running_jobs)
+                if jobs_submitted or current_running_jobs != previous_running_jobs:
+                    wait_interval = polling_interval
+                else:
+                    wait_interval = min(wait_interval * 2, max_polling_interval)
+                previous_running_jobs = current_running_jobs
+                
+                # Wait for the polling interval, or until wake() is called
+                print(f"Waiting {wait_interval} seconds before next check...")
+                self._wake.wait(wait_interval)
+                self._wake.clear()
                 
         except KeyboardInterrupt:
             print("\n\nJob tracker interrupted by user. Currently running jobs will continue.")
+        finally:
+            self._defer_saves = False
+            # Leave a compacted file behind, with one row per job
+            if self._csv_row_count > len(self.job_status):
+                self._full_rewrite_needed = True
+            self.flush()
+            self._compact_failed_batches()
             
         print("\n=== Job Tracker Finished ===")
         print(f"Job status saved to: {self.job_status_file}")
         if self.failed_batches:
             print(f"Failed batches saved to: {self.failed_batches_file}")
     
+    def _get_single_cif_scheduler(self) -> JobScheduler:
+        """
+        Get the JobScheduler used for single-CIF jobs, creating it on first use
+        
+        Returns:
+            JobScheduler that writes job scripts to the singles temp_scripts directory
+        """
+        if self._single_cif_scheduler is None:
+            output_config = self.config['output']
+            
+            # Create a temporary directory for script generation
+            temp_scripts_dir = os.path.join(output_config['base_dir'], 'singles', 'temp_scripts')
+            os.makedirs(temp_scripts_dir, exist_ok=True)
+            
+            # Create a modified config for the job scheduler with the correct output directory;
+            # the overrides are layered over the original config instead of copying it, and any
+            # write through the view lands in the override layer, never in self.config
+            modified_config = ChainMap(
+                {'output': ChainMap({'scripts_dir': temp_scripts_dir}, output_config)},
+                self.config)
+            
+            self._single_cif_scheduler = JobScheduler(modified_config)
+        return self._single_cif_scheduler
+    
+    def run_many_cifs(self, cif_paths: List[str], dry_run: bool = False) -> int:
+        """
+        Run a simulation for each of several CIF files
+        
+        Args:
+            cif_paths: Paths to the CIF files
+            dry_run: If True, generate job scripts but don't submit
+            
+        Returns:
+            Number of CIF files processed successfully
+        """
+        succeeded = 0
+        # Write the job status once for all submissions rather than once per CIF
+        with self.deferred_saves():
+            for cif_path in cif_paths:
+                if self.run_single_cif(cif_path, dry_run=dry_run):
+                    succeeded += 1
+        return succeeded
+    
     def run_single_cif(self, cif_path, dry_run=False):
         """
         Run a simulation for a single CIF file
@@ -939,82 +1899,84 @@ class JobTracker:
         """
         cif_name = os.path.basename(cif_path)
         structure_name = os.path.splitext(cif_name)[0]
+        output_config = self.config['output']
+        db_path = self.config['database']['path']
         
         print(f"Processing structure: {structure_name}")
         
-        # Create a singles directory under the output directory structure
-        singles_dir = os.path.join(self.config['output']['base_dir'], 'singles')
-        os.makedirs(singles_dir, exist_ok=True)
+        # Single-CIF jobs bypass max_concurrent_jobs, so fail fast once too many are queued
+        if not dry_run and self._pending_limit_reached():
+            return False
         
-        # Create structure-specific directory for this single job
-        structure_dir = os.path.join(singles_dir, structure_name)
-        os.makedirs(structure_dir, exist_ok=True)
+        if not os.path.exists(cif_path):
+            print(f"❌ CIF file not found: {cif_path}")
+            return False
         
-        # Create job scripts directory
+        # Singles directory under the output directory structure, with a
+        # structure-specific directory for this single job
+        singles_dir = os.path.join(output_config['base_dir'], 'singles')
+        structure_dir = os.path.join(singles_dir, structure_name)
         scripts_dir = os.path.join(structure_dir, 'scripts')
-        os.makedirs(scripts_dir, exist_ok=True)
-        
-        # Create results directory
         results_dir = os.path.join(structure_dir, 'results')
-        os.makedirs(results_dir, exist_ok=True)
+        
+        # Creating the leaf directories also creates the singles and structure directories
+        for directory in (scripts_dir, results_dir):
+            os.makedirs(directory, exist_ok=True)
         
         # Copy CIF file to expected location if needed
         target_cif_path = cif_path
-        if not os.path.exists(cif_path):
-            print(f"❌ CIF file not found: {cif_path}")
-            return False
-        
-        if not cif_path.startswith(self.config['database']['path']):
-            target_cif_path = os.path.join(self.config['database']['path'], cif_name)
-            shutil.copy(cif_path, target_cif_path)
-            print(f"Copied CIF file to database directory: {target_cif_path}")
+        if not cif_path.startswith(db_path):
+            target_cif_path = os.path.join(db_path, cif_name)
+            try:
+                source_stat = os.stat(cif_path)
+                target_stat = os.stat(target_cif_path)
+            except FileNotFoundError:
+                target_stat = None
+            if target_stat is not None and (
+                    os.path.samestat(source_stat, target_stat)
+                    # Same size and not older than the source: an earlier copy of this file
+                    or (target_stat.st_size == source_stat.st_size
+                        and target_stat.st_mtime_ns >= source_stat.st_mtime_ns)):
+                print(f"CIF file already in database directory: {target_cif_path}")
+            else:
+                if target_stat is not None:
+                    # Replace a different file of the same name
+                    shutil.copyfile(cif_path, target_cif_path)
+                else:
+                    try:
+                        # A hard link avoids duplicating the file on the same filesystem
+                        os.link(cif_path, target_cif_path)
+                    except OSError:
+                        # Cross-device or unsupported: copyfile uses the kernel's fast copy paths
+                        shutil.copyfile(cif_path, target_cif_path)
+                print(f"Copied CIF file to database directory: {target_cif_path}")
         
         # Generate job script
         job_script_path = os.path.join(scripts_dir, f"job_{structure_name}.sh")
         print(f"Generating job script at: {job_script_path}")
         
         # Determine the next available batch ID by checking existing batch files
-        batch_dir = self.config['output']['batches_dir']
-        batch_files = [f for f in os.listdir(batch_dir) 
-                      if f.startswith('batch_') and f.endswith('.csv')]
-        
-        # Extract numbers from batch_X.csv filenames and find max
-        batch_numbers = []
-        for f in batch_files:
-            try:
-                num_part = f.replace('batch_', '').replace('.csv', '')
-                batch_numbers.append(int(num_part))
-            except ValueError:
-                continue
-        
-        # Use max batch number + 1, or start from 1 if none exists
-        batch_id = max(batch_numbers) + 1 if batch_numbers else 1
+        batch_dir = output_config['batches_dir']
+        batch_id = (self.batch_manager._get_max_batch_number() or 0) + 1
         
         print(f"Assigned batch ID: {batch_id}")
         
         # Create a batch file for this single CIF
         batch_file = os.path.join(batch_dir, f'batch_{batch_id}.csv')
         
-        # Create a batch CSV file with this single CIF file
-        batch_df = pd.DataFrame({'file_path': [target_cif_path]})
-        batch_df.to_csv(batch_file, index=False)
+        # Create a batch CSV file with this single CIF file; the csv module writes the same
+        # bytes as DataFrame.to_csv(index=False) without building a one-row frame
+        with open(batch_file, 'w', newline='') as f:
+            csv.writer(f, lineterminator='\n').writerows([['file_path'], [target_cif_path]])
+        self.batch_manager._record_batch_file(batch_id)
         print(f"Created batch file: {batch_file}")
         
         # Create batch results directory
-        batch_results_dir = os.path.join(self.config['output']['results_dir'], f'batch_{batch_id}')
+        batch_results_dir = os.path.join(output_config['results_dir'], f'batch_{batch_id}')
         os.makedirs(batch_results_dir, exist_ok=True)
         
-        # Create a modified config for the job scheduler with the correct output directory
-        modified_config = self.config.copy()
-        modified_config['output'] = self.config['output'].copy()
-        
-        # Create a temporary directory for script generation
-        temp_scripts_dir = os.path.join(singles_dir, 'temp_scripts')
-        os.makedirs(temp_scripts_dir, exist_ok=True)
-        modified_config['output']['scripts_dir'] = temp_scripts_dir
-        
-        # Use the job scheduler with modified config
-        job_scheduler = JobScheduler(modified_config)
+        # The scheduler for single-CIF scripts only depends on the config, so it is set up once
+        job_scheduler = self._get_single_cif_scheduler()
         
         # Create the job script - this will return a path to the generated script
         try:
@@ -1033,6 +1995,8 @@ class JobTracker:
         
         # Submit the job if not dry run
         if not dry_run:
+            # Pick up mappings other schedulers saved since the last call, so saving ours keeps them
+            job_scheduler._load_batch_job_map()
             job_id = job_scheduler.submit_job(job_script_path, batch_id=batch_id)
             if job_id:
                 print(f"Job submitted with ID: {job_id}")
@@ -1042,15 +2006,15 @@ class JobTracker:
                 timestamp = self._format_timestamp()
                 new_row = {
                     'batch_id': batch_id,  # Now using an integer batch ID
-                    'job_id': job_id if job_id != "dry-run" else "dry-run",
+                    # Store numeric IDs as integers so the job_id column is not widened to object
+                    'job_id': int(job_id) if job_id != "dry-run" else "dry-run",
                     'status': 'PENDING',
                     'submission_time': timestamp,
                     'completion_time': None
                 }
                 
-                # Create a new DataFrame with correct types and append
-                new_df = pd.DataFrame([new_row], columns=self.job_status.columns).astype(self.job_status.dtypes)
-                self.job_status = pd.concat([self.job_status, new_df], ignore_index=True)
+                # Buffered; it joins the table with any other new rows on the next read
+                self._append_job_row(new_row)
                 self._save_job_status()
                 
                 return True
@@ -13,6 +13,7 @@ from datetime import datetime
 
 # Import the extract_averages function
 from gRASPA_job_tracker.scripts.parse_graspa_output import extract_averages as original_extract_averages
+from gRASPA_job_tracker.utils import atomic_write_csv, file_lock
 
 def safe_extract_averages(data_file):
     """
@@ -550,37 +551,46 @@ def update_job_status_for_batch(batch_id, exit_status):
         
     # Read the job status file
     try:
-        df = pd.read_csv(job_status_file)
-        batch_rows = df[df['batch_id'] == batch_id]
+        # Hold the job status lock from the read to the rewrite so rows that the tracker
+        # appends in between are not lost. The wait is bounded so a stuck lock holder cannot
+        # keep this compute job running; the tracker still picks up the batch's exit status
+        with file_lock(job_status_file, timeout=30.0) as locked:
+            if not locked:
+                print(f"Warning: Could not lock {job_status_file} within 30 seconds; "
+                      f"job status for batch {batch_id} was not updated")
+                return
+            
+            df = pd.read_csv(job_status_file)
+            batch_rows = df[df['batch_id'] == batch_id]
         
-        if batch_rows.empty:
-            print(f"Warning: Batch {batch_id} not found in job status file")
-            return
+            if batch_rows.empty:
+                print(f"Warning: Batch {batch_id} not found in job status file")
+                return
             
-        # Update the status based on exit status code
-        if exit_status == "0":
-            new_status = "COMPLETED"
-            workflow_stage = "completed"
-        elif exit_status == "1":
-            new_status = "FAILED"
-            workflow_stage = "analysis (failed)"
-        elif exit_status == "2":
-            new_status = "PARTIALLY_COMPLETE"
-            workflow_stage = "analysis (partially complete)"
+            # Update the status based on exit status code
+            if exit_status == "0":
+                new_status = "COMPLETED"
+                workflow_stage = "completed"
+            elif exit_status == "1":
+                new_status = "FAILED"
+                workflow_stage = "analysis (failed)"
+            elif exit_status == "2":
+                new_status = "PARTIALLY_COMPLETE"
+                workflow_stage = "analysis (partially complete)"
             
-        # Update the last row for this batch (most recent job)
-        last_row_idx = batch_rows.index[-1]
-        df.loc[last_row_idx, 'status'] = new_status
-        df.loc[last_row_idx, 'workflow_stage'] = workflow_stage
+            # Update the last row for this batch (most recent job)
+            last_row_idx = batch_rows.index[-1]
+            df.loc[last_row_idx, 'status'] = new_status
+            df.loc[last_row_idx, 'workflow_stage'] = workflow_stage
         
-        # Update completion time if not already set
-        if pd.isna(df.loc[last_row_idx, 'completion_time']):
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            df.loc[last_row_idx, 'completion_time'] = timestamp
+            # Update completion time if not already set
+            if pd.isna(df.loc[last_row_idx, 'completion_time']):
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                df.loc[last_row_idx, 'completion_time'] = timestamp
             
-        # Save the updated file
-        df.to_csv(job_status_file, index=False)
-        print(f"Updated job status for batch {batch_id} to {new_status}")
+            # Save the updated file by replacing it, so readers never mistake the rewrite for an append
+            atomic_write_csv(df, job_status_file)
+            print(f"Updated job status for batch {batch_id} to {new_status}")
         
     except Exception as e:
         print(f"Error updating job status file: {e}")
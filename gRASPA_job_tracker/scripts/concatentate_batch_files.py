@@ -150,7 +150,7 @@ def find_batch_result_files(input_dir: str, batch_dirs: List[str], output_dir: s
         # Compare with expected standard file if it exists
         if expected_exists:
             # Load structure IDs from both files to identify missing structures
-            expected_structures = {}  # Store normalized ID -> original ID mapping
+            expected_structures = {}  # Store normalized ID -> (original ID, underscored ID) mapping
             actual_structures = {}    # Store normalized ID -> original ID mapping
             
             try:
@@ -170,8 +170,8 @@ def find_batch_result_files(input_dir: str, batch_dirs: List[str], output_dir: s
                     for row in reader:
                         if row:  # Skip empty rows
                             orig_id = row[structure_col].strip()
-                            norm_id, _ = normalize_structure_id(orig_id)
-                            expected_structures[norm_id] = orig_id
+                            norm_id, norm_id_underscored = normalize_structure_id(orig_id)
+                            expected_structures[norm_id] = (orig_id, norm_id_underscored)
                 
                 # Load actual structures from result file
                 with open(result_file, 'r', newline='') as f:
@@ -194,11 +194,9 @@ def find_batch_result_files(input_dir: str, batch_dirs: List[str], output_dir: s
                 
                 # Find missing structures using normalized IDs
                 missing = []
-                for norm_id, orig_id in expected_structures.items():
-                    norm_id_regular, norm_id_underscored = normalize_structure_id(orig_id)
-                    
+                for norm_id, (orig_id, norm_id_underscored) in expected_structures.items():
                     # Check if either version of the normalized ID exists in actual structures
-                    if norm_id_regular not in actual_structures and norm_id_underscored not in actual_structures:
+                    if norm_id not in actual_structures and norm_id_underscored not in actual_structures:
                         missing.append(orig_id)
                 
                 if missing:
@@ -299,21 +297,18 @@ def concatenate_csv_files(input_dir: str, batch_range: Optional[Tuple[int, int]]
         print(f"❌ Error: No batch directories found in {input_dir}")
         return False
     
-    # Sort batch directories by batch number
-    batch_dirs.sort(key=lambda x: int(x.split("_")[1]))
+    # Parse each directory's batch number once and sort by it
+    batch_numbers = {d: int(d.split("_")[1]) for d in batch_dirs}
+    batch_dirs.sort(key=batch_numbers.get)
     
     if verbose:
-        print(f"Found {len(batch_dirs)} batch directories (batch_{int(batch_dirs[0].split('_')[1])} to batch_{int(batch_dirs[-1].split('_')[1])})")
+        print(f"Found {len(batch_dirs)} batch directories (batch_{batch_numbers[batch_dirs[0]]} to batch_{batch_numbers[batch_dirs[-1]]})")
     
     # Filter by batch range if specified
     if batch_range and not all_files:
         start_batch, end_batch = batch_range
         
-        filtered_dirs = []
-        for batch_dir in batch_dirs:
-            batch_num = int(batch_dir.split("_")[1])
-            if start_batch <= batch_num <= end_batch:
-                filtered_dirs.append(batch_dir)
+        filtered_dirs = [d for d in batch_dirs if start_batch <= batch_numbers[d] <= end_batch]
         
         if not filtered_dirs:
             print(f"❌ Error: No batch directories found in range {start_batch} to {end_batch}")
@@ -345,9 +340,9 @@ def concatenate_csv_files(input_dir: str, batch_range: Optional[Tuple[int, int]]
         with open(log_file, 'w') as log:
             log.write(f"Missing or unexpected structures for {result_type} files:\n\n")
             
-            for batch_dir in sorted(missing_structures.keys(), key=lambda x: int(x.split('_')[1])):
+            for batch_dir in sorted(missing_structures.keys(), key=batch_numbers.get):
                 batch_info = missing_structures[batch_dir]
-                batch_num = int(batch_dir.split("_")[1])
+                batch_num = batch_numbers[batch_dir]
                 
                 log.write(f"Batch {batch_num}:\n")
                 
@@ -371,9 +366,9 @@ def concatenate_csv_files(input_dir: str, batch_range: Optional[Tuple[int, int]]
             writer = csv.writer(csvfile)
             writer.writerow(["batch", "structure_id", "issue"])
             
-            for batch_dir in sorted(missing_structures.keys(), key=lambda x: int(x.split('_')[1])):
+            for batch_dir in sorted(missing_structures.keys(), key=batch_numbers.get):
                 batch_info = missing_structures[batch_dir]
-                batch_num = int(batch_dir.split("_")[1])
+                batch_num = batch_numbers[batch_dir]
                 
                 # Add rows for missing structures
                 for structure in sorted(batch_info["missing_structures"]):
@@ -458,9 +453,9 @@ def concatenate_csv_files(input_dir: str, batch_range: Optional[Tuple[int, int]]
                 writer = csv.writer(csvfile)
                 writer.writerow(["batch", "structure_id", "issue"])
                 
-                for batch_dir in sorted(missing_structures.keys(), key=lambda x: int(x.split('_')[1])):
+                for batch_dir in sorted(missing_structures.keys(), key=batch_numbers.get):
                     batch_info = missing_structures[batch_dir]
-                    batch_num = int(batch_dir.split("_")[1])
+                    batch_num = batch_numbers[batch_dir]
                     
                     # Add rows for missing structures
                     for structure in sorted(batch_info["missing_structures"]):
@@ -2,8 +2,11 @@ import os
 import yaml
 import shutil
 import subprocess
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 
 def create_default_config(output_path: str, template_config_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -70,9 +73,12 @@ def get_hardcoded_default_config() -> Dict[str, Any]:
         'batch': {
             'size': 100,  # Number of structures per batch
             'max_concurrent_jobs': 5,  # Maximum number of concurrent jobs
+            'max_pending_jobs': 100000,  # Reject single-CIF and next-job submissions beyond this many active jobs
             'strategy': 'alphabetical',  # Options: alphabetical, size_based, random
             'size_thresholds': [],  # File sizes in bytes for batching if strategy is size_based
             'copy_files': False,  # Whether to copy CIF files to batch directories
+            'max_failure_rate': 0.5,  # Pause submissions above this recent failure rate (null disables)
+            'failure_window': 20,  # Number of recently finished jobs the failure rate is computed over
         },
         'scripts': {
             'partial_charge': os.path.join(current_dir, 'scripts', 'gen_partial_charge.py'),
@@ -170,3 +176,74 @@ def create_project_structure(base_dir: str, project_name: str) -> Dict[str, str]
     print(f"Created default config: {config_path}")
     
     return paths
+
+def is_dir_empty(path: str) -> bool:
+    """
+    Check whether a directory has no entries, stopping at the first one found
+    
+    Args:
+        path: Directory to check
+        
+    Returns:
+        True if the directory is empty, False otherwise
+    """
+    with os.scandir(path) as entries:
+        return next(entries, None) is None
+
+@contextmanager
+def file_lock(path: str, timeout: Optional[float] = None) -> Iterator[bool]:
+    """
+    Hold an exclusive lock guarding a file that several processes write
+    
+    The lock is taken on a separate '<path>.lock' file that is never removed, so it stays
+    valid while the guarded file itself is replaced with os.replace.
+    
+    Args:
+        path: Path of the guarded file
+        timeout: Maximum time (in seconds) to wait for the lock, or None to wait indefinitely
+        
+    Yields:
+        True while the lock is held, False if it could not be acquired in time
+    """
+    import fcntl
+    
+    fd = os.open(f"{path}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        if timeout is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            acquired = True
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        acquired = False
+                        break
+                    time.sleep(0.05)
+        yield acquired
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+def atomic_write_csv(df, path: str) -> None:
+    """
+    Write a DataFrame to CSV atomically
+    
+    The data is written to a uniquely named temporary file next to the target and
+    moved into place with os.replace, so readers never see a half-written file.
+    
+    Args:
+        df: pandas DataFrame to write
+        path: Destination CSV path
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
+    try:
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
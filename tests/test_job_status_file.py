@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Unit tests for how JobTracker stores job_status.csv.
+
+Status changes are appended to the file and deduplicated (last row wins) when it is
+read, the file is compacted once superseded rows dominate it, and other writers
+replace it under the shared job status lock. These tests need no SLURM installation
+and can be run with:
+python -m unittest tests.test_job_status_file
+"""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+import contextlib
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from gRASPA_job_tracker.job_tracker import JobTracker
+from gRASPA_job_tracker.utils import file_lock
+
+
+def make_config(root):
+    """Create a small CIF database under root and return a tracker configuration for it."""
+    database = os.path.join(root, 'raw')
+    os.makedirs(database)
+    for i in range(4):
+        with open(os.path.join(database, f'S{i}.cif'), 'w') as f:
+            f.write('data_x\n')
+
+    output = os.path.join(root, 'out')
+    return {
+        'project': {'name': 'test'},
+        'database': {'path': database},
+        'output': {
+            'base_dir': output,
+            'output_dir': output,
+            'results_dir': os.path.join(output, 'results'),
+            'batches_dir': os.path.join(output, 'batches'),
+            'scripts_dir': os.path.join(output, 'job_scripts'),
+            'logs_dir': os.path.join(output, 'job_logs'),
+        },
+        'batch': {'size': 2, 'max_concurrent_jobs': 2, 'strategy': 'alphabetical'},
+        'scripts': {},
+        'run_file_templates': {},
+        'slurm_config': {'account': 'a', 'partition': 'p', 'time': '1:00:00', 'nodes': 1},
+    }
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+class JobStatusFileTest(unittest.TestCase):
+    """Test case for the append-only job status file."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.config = make_config(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def new_tracker(self):
+        return quiet(JobTracker, self.config)
+
+    def add_job(self, tracker, batch_id, job_id, status='PENDING'):
+        """Record a new job and save it; returns the row label."""
+        label = len(tracker.job_status)
+        tracker._append_job_row({
+            'batch_id': batch_id,
+            'job_id': job_id,
+            'status': status,
+            'submission_time': tracker._format_timestamp(),
+            'completion_time': None,
+        })
+        quiet(tracker._save_job_status)
+        return label
+
+    def set_status(self, tracker, label, status):
+        tracker._set_job_fields([label], status=status)
+        quiet(tracker._save_job_status)
+
+    def file_rows(self, tracker):
+        """Number of data rows in the job status file as written."""
+        with open(tracker.job_status_file) as f:
+            return sum(1 for _ in f) - 1
+
+    def test_appended_changes_reload_as_one_row_per_job(self):
+        tracker = self.new_tracker()
+        first = self.add_job(tracker, 1, 101)
+        second = self.add_job(tracker, 2, 102)
+        self.set_status(tracker, first, 'RUNNING')
+        self.set_status(tracker, first, 'COMPLETED')
+        self.set_status(tracker, second, 'FAILED')
+
+        # Every change was appended rather than rewriting the file
+        self.assertEqual(self.file_rows(tracker), 5)
+
+        reloaded = self.new_tracker()
+        rows = reloaded.job_status
+        self.assertEqual(len(rows), 2)
+        self.assertFalse(rows.duplicated(['batch_id', 'job_id']).any())
+        self.assertEqual(dict(zip(rows['job_id'], rows['status'])), {101: 'COMPLETED', 102: 'FAILED'})
+        # Rows keep the position where the job was first recorded
+        self.assertEqual(list(rows['batch_id']), [1, 2])
+
+    def test_compaction_rewrites_an_equivalent_file(self):
+        tracker = self.new_tracker()
+        labels = [self.add_job(tracker, batch_id, 100 + batch_id) for batch_id in (1, 2)]
+
+        limit = JobTracker.COMPACTION_RATIO * len(labels)
+        statuses = ['RUNNING', 'PENDING'] * limit
+        for status in statuses:
+            for label in labels:
+                self.set_status(tracker, label, status)
+            # The file never holds more than COMPACTION_RATIO rows per tracked job
+            self.assertLessEqual(self.file_rows(tracker), limit)
+        self.set_status(tracker, labels[0], 'COMPLETED')
+
+        # Force a final compaction and compare it with the in-memory table
+        tracker._full_rewrite_needed = True
+        quiet(tracker._save_job_status)
+        self.assertEqual(self.file_rows(tracker), len(labels))
+
+        reloaded = self.new_tracker()
+        columns = ['batch_id', 'job_id', 'status', 'submission_time', 'completion_time']
+        pd.testing.assert_frame_equal(
+            reloaded.job_status[columns].astype({'status': str}),
+            tracker.job_status[columns].astype({'status': str}))
+
+    def test_scheduler_rewrite_between_appends_keeps_rows(self):
+        tracker = self.new_tracker()
+        self.add_job(tracker, 1, 101)
+
+        # The scheduler rewrites the whole file with batch 1 completed
+        batch_dir = os.path.join(self.config['output']['results_dir'], 'batch_1')
+        os.makedirs(batch_dir, exist_ok=True)
+        with open(os.path.join(batch_dir, 'exit_status.log'), 'w') as f:
+            f.write('0\n')
+        tracker.job_scheduler.batch_job_map = {'101': 1}
+        quiet(tracker.job_scheduler.update_job_status_csv, queue_jobs=set())
+
+        self.add_job(tracker, 2, 102)
+
+        reloaded = self.new_tracker()
+        rows = reloaded.job_status
+        self.assertEqual(dict(zip(rows['batch_id'], rows['status'])), {1: 'COMPLETED', 2: 'PENDING'})
+
+    def test_scheduler_rewrite_waits_for_the_job_status_lock(self):
+        tracker = self.new_tracker()
+        self.add_job(tracker, 1, 101)
+        tracker.job_scheduler.batch_job_map = {'101': 1}
+
+        with file_lock(tracker.job_status_file):
+            rewrite = threading.Thread(target=tracker.job_scheduler.update_job_status_csv,
+                                       kwargs={'queue_jobs': set()})
+            with contextlib.redirect_stdout(io.StringIO()):
+                rewrite.start()
+                rewrite.join(0.5)
+                self.assertTrue(rewrite.is_alive())
+
+                # A row appended by a lock holder before the rewrite reads the file
+                with open(tracker.job_status_file, 'a') as f:
+                    f.write('2,102,PENDING,2024-01-01 00:00:00,,\n')
+        rewrite.join(10)
+        self.assertFalse(rewrite.is_alive())
+
+        rows = pd.read_csv(tracker.job_status_file)
+        self.assertEqual(sorted(rows['batch_id']), [1, 2])
+
+    def test_external_append_is_read_from_the_tail(self):
+        writer = self.new_tracker()
+        first = self.add_job(writer, 1, 101)
+
+        reader = self.new_tracker()
+        self.assertEqual(len(reader.job_status), 1)
+
+        # Another tracker appends a new job and a status change
+        self.add_job(writer, 2, 102)
+        self.set_status(writer, first, 'RUNNING')
+
+        # Only the appended rows are parsed; a full read would fail here
+        with mock.patch.object(JobTracker, '_read_job_status', side_effect=AssertionError('full read')):
+            rows = reader._reload_job_status()
+        self.assertEqual(dict(zip(rows['job_id'], rows['status'])), {101: 'RUNNING', 102: 'PENDING'})
+        self.assertEqual(reader._job_status_file_state, reader._get_job_status_file_state())
+
+    def test_rewritten_file_is_read_in_full(self):
+        writer = self.new_tracker()
+        self.add_job(writer, 1, 101)
+        reader = self.new_tracker()
+
+        # A rewrite replaces the file, so the remembered tail no longer matches
+        writer._full_rewrite_needed = True
+        self.add_job(writer, 2, 102)
+
+        self.assertIsNone(reader._read_appended_job_status())
+        rows = reader._reload_job_status()
+        self.assertEqual(sorted(rows['job_id']), [101, 102])
+
+
+if __name__ == "__main__":
+    unittest.main()